@@ -0,0 +1,96 @@
+# NeuralNetwork/activations.py
+import numpy as np
+
+class Activation:
+    """A vectorized activation function with its derivative.
+
+    ``function(x, out=None)`` may write its result into ``out`` (which can be
+    ``x`` itself). ``derivative(y)`` is expressed in terms of the function's
+    output ``y``, which is what backpropagation has at hand.
+    """
+    def __init__(self, name, function, derivative):
+        self.name = name
+        self.function = function
+        self.derivative = derivative
+
+    def __call__(self, x, out=None):
+        return self.function(x, out)
+
+    def __repr__(self):
+        return f"Activation({self.name!r})"
+
+def _output(x, out):
+    return np.empty(np.shape(x)) if out is None else out
+
+def _sigmoid(x, out=None):
+    # Via tanh, which saturates instead of overflowing for inputs of any size
+    out = np.multiply(x, 0.5, out=_output(x, out))
+    np.tanh(out, out=out)
+    out += 1
+    out *= 0.5
+    return out
+
+def _sigmoid_derivative(y):
+    return y * (1.0 - y)
+
+def _tanh(x, out=None):
+    return np.tanh(x, out=out)
+
+def _tanh_derivative(y):
+    return 1.0 - y * y
+
+def _relu(x, out=None):
+    return np.maximum(x, 0.0, out=out)
+
+def _relu_derivative(y):
+    return (y > 0).astype(y.dtype)
+
+LEAKY_RELU_SLOPE = 0.01
+
+def _leaky_relu(x, out=None):
+    return np.maximum(x, np.multiply(x, LEAKY_RELU_SLOPE), out=out)
+
+def _leaky_relu_derivative(y):
+    return np.where(y > 0, 1.0, LEAKY_RELU_SLOPE)
+
+def _linear(x, out=None):
+    out = _output(x, out)
+    out[...] = x
+    return out
+
+def _linear_derivative(y):
+    return np.ones_like(y)
+
+def scaled_tanh(incoming_activation, out=None):
+    # Simple activation function (e.g., tanh) scaled to 0-100
+    activation = np.divide(incoming_activation, 100.0, out=_output(incoming_activation, out)) # Scale input
+    np.tanh(activation, out=activation)
+    activation += 1
+    activation *= 50 # Map from [-1, 1] to [0, 100]
+    return activation
+
+def _scaled_tanh_derivative(y):
+    activation = y / 50.0 - 1.0
+    return 0.5 * (1.0 - activation * activation)
+
+ACTIVATIONS = {}
+
+def register_activation(name, function, derivative):
+    """Make an activation available by name to BackpropNetwork layers and Config.activations."""
+    ACTIVATIONS[name] = Activation(name, function, derivative)
+    return ACTIVATIONS[name]
+
+def get_activation(activation):
+    """An Activation from an instance or a registered name."""
+    if isinstance(activation, Activation):
+        return activation
+    if activation not in ACTIVATIONS:
+        raise ValueError(f"Unknown activation: {activation}")
+    return ACTIVATIONS[activation]
+
+register_activation('sigmoid', _sigmoid, _sigmoid_derivative)
+register_activation('tanh', _tanh, _tanh_derivative)
+register_activation('relu', _relu, _relu_derivative)
+register_activation('leaky_relu', _leaky_relu, _leaky_relu_derivative)
+register_activation('linear', _linear, _linear_derivative)
+register_activation('scaled_tanh', scaled_tanh, _scaled_tanh_derivative)
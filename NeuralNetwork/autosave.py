@@ -0,0 +1,119 @@
+# NeuralNetwork/autosave.py
+import os
+import json
+import time
+import queue
+import threading
+from .formats import is_binary_path, compression_of, write_replacing, write_npz, write_json
+from .journal import journal_path
+
+class AutoSaver:
+    """Saves a network to ``path`` on a background thread.
+
+    ``request`` asks for a save; ``poll`` also starts one every ``interval``
+    seconds if one is given and the network has changed since the last save
+    (or since the AutoSaver was created). Both must be called from the thread
+    that changes the network (the GUI thread, or a ``Network.run`` callback).
+    When a save is due and none is in flight, the network is copied there
+    (``Network.snapshot``) and the copy is written on the background thread:
+    to a temporary file first, which then replaces ``path`` in one rename, so
+    ``path`` always holds a complete network. Requests made while a save is
+    in flight are coalesced into one save, taken at the next ``poll`` after
+    it finished. ``.npz`` paths are written in the binary format, all others
+    as JSON (compressed for .gz, .bz2 and .xz).
+
+    ``path`` must not be the snapshot of a Journal attached to the network:
+    the autosave replaces that file behind the journal's back.
+    """
+    def __init__(self, network, path, interval=None):
+        self.network = network
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self.saves = 0
+        self.coalesced = 0
+        self.last_duration = None
+        self.last_error = None
+        self._dirty = False
+        self._saved = self._version()
+        self._last_start = time.monotonic()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='network-autosave', daemon=True)
+        self._thread.start()
+
+    def request(self):
+        """Ask for a save; returns True if one was started right away."""
+        if self._dirty or not self._idle.is_set():
+            self.coalesced += 1
+        self._dirty = True
+        return self.poll()
+
+    def _version(self):
+        # Counters for the connections, plus the neurons, state and config, which change without one
+        network = self.network
+        neurons = json.dumps([[name, n.position, n.type, n.attributes] for name, n in network.neurons.items()])
+        config = json.dumps(network.config.to_dict())
+        return (network.weights_version, network.topology_version, network.decay_epoch, neurons, dict(network.state), config)
+
+    def poll(self):
+        """Start a save if one is due and none is in flight; returns True if one was started."""
+        due = self._dirty or (self.interval is not None and time.monotonic() - self._last_start >= self.interval)
+        if not due or not self._idle.is_set():
+            return False
+        version = self._version()
+        if not self._dirty and version == self._saved:
+            # Nothing to save; look again after another interval
+            self._last_start = time.monotonic()
+            return False
+        journal = self.network.journal
+        if journal is not None and journal.snapshot_path == self.path:
+            raise ValueError("Autosave path is the snapshot of the network's journal")
+        snapshot = self.network.snapshot()
+        self._saved = version
+        self._dirty = False
+        self._last_start = time.monotonic()
+        self._idle.clear()
+        self._jobs.put(snapshot)
+        return True
+
+    def busy(self):
+        return not self._idle.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for the save in flight; returns False on timeout."""
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Write any requested save, wait for it and stop the background thread."""
+        self.wait()
+        if self._dirty:
+            self.poll()
+            self.wait()
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            snapshot = self._jobs.get()
+            if snapshot is None:
+                return
+            start = time.perf_counter()
+            try:
+                self._write(*snapshot)
+                self.saves += 1
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"Error autosaving network: {e}")
+            self.last_duration = time.perf_counter() - start
+            self._idle.set()
+
+    def _write(self, arrays, meta):
+        if is_binary_path(self.path):
+            write_replacing(self.path, write_npz, arrays, meta)
+        else:
+            write_replacing(self.path, write_json, arrays, meta, compression_of(self.path))
+        # As with Network.save, the new file supersedes a journal next to it
+        if os.path.exists(journal_path(self.path)):
+            os.remove(journal_path(self.path))
@@ -0,0 +1,58 @@
+# NeuralNetwork/batch.py
+import numpy as np
+
+class BatchEvaluator:
+    """Advances many state vectors through one Network topology at once.
+
+    Useful for populations of agents that share the same brain: instead of one
+    ``propagate_activation`` per agent, the states are stacked into an
+    (M x N) matrix and a step is a single product with the (N x N) weight
+    matrix. Columns follow ``names`` (the network's neuron order). The weights
+    are re-read automatically when the network's topology or weights change.
+    """
+    def __init__(self, network):
+        self.network = network
+        self._compiled_for = None
+        self.refresh()
+
+    def refresh(self):
+        topology = self.network.compiled_topology()
+        self.names = topology.names
+        self.index = topology.index
+        self.matrix = np.zeros((len(self.names), len(self.names)), dtype=np.float64)
+        self.matrix[topology.sources, topology.targets] = topology.weights()
+        self._compiled_for = (topology, self.network.weights_version)
+
+    def _ensure_current(self):
+        if self._compiled_for != (self.network.compiled_topology(), self.network.weights_version):
+            self.refresh()
+
+    def new_states(self, count, fill=0.0):
+        """An (count x N) state matrix initialised to ``fill``."""
+        self._ensure_current()
+        return np.full((count, len(self.names)), fill, dtype=np.float64)
+
+    def stack(self, states):
+        """Build a state matrix from a sequence of ``{name: value}`` dicts."""
+        matrix = self.new_states(len(states))
+        for row, state in enumerate(states):
+            for name, value in state.items():
+                col = self.index.get(name)
+                if col is not None:
+                    matrix[row, col] = value
+        return matrix
+
+    def columns(self, names):
+        """Column indices for a list of neuron names."""
+        self._ensure_current()
+        return [self.index[name] for name in names]
+
+    def step(self, states, out=None):
+        """Equivalent of ``propagate_activation`` applied to every row of ``states``."""
+        self._ensure_current()
+        incoming = np.matmul(states, self.matrix, out=out)
+        result = self.network._activate(self.network.compiled_topology(), incoming)
+        if out is not None:
+            out[...] = result
+            return out
+        return result
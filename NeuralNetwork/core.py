@@ -1,8 +1,21 @@
 # NeuralNetwork/core.py
+import os
+import gc
 import random
 import time
 import json
 import math
+import sys
+import uuid
+from collections import deque
+from itertools import repeat
+from contextlib import contextmanager
+import numpy as np
+from .storage import ArrayStore, NeuronView, ConnectionView, StateView, _grow
+from .activations import scaled_tanh, get_activation
+from .formats import is_binary_path, compression_of, open_text, attribute_table, write_replacing, write_npz, read_npz
+from .initializers import initial_weights
+from .journal import journal_path, journal_handover, replay_journal
 
 class Config:
     """Holds configuration for the network, learning, and neurogenesis."""
@@ -12,7 +25,14 @@ class Config:
             'active_threshold': 50,
             'learning_interval': 30000,
             'weight_decay': 0.01,
+            # Pruning of dead connections after each learning cycle (0 disables a criterion)
+            'prune_threshold': 0.0,      # remove connections with |weight| below this...
+            'prune_min_age': 10,         # ...once they have existed for this many learning cycles
+            'prune_batch_size': 256,     # connections checked per cycle (round-robin)
+            'max_edges_per_neuron': 0,   # cap on connections touching an active neuron; weakest go first
         }
+        # Activation per neuron type (a name from activations.py or an Activation); other types use scaled_tanh
+        self.activations = {}
         self.neurogenesis = {
             'enabled_globally': True,
             'novelty_threshold': 3.0,
@@ -42,14 +62,65 @@ class Config:
             }
         }
 
+    def to_dict(self):
+        """The config block of a saved network; activations are stored by name."""
+        return {
+            'hebbian': self.hebbian,
+            'neurogenesis': self.neurogenesis,
+            'activations': {n_type: getattr(a, 'name', a) for n_type, a in self.activations.items()},
+        }
+
+    def update(self, data):
+        """Apply a config block written by ``to_dict`` (older files lack some keys)."""
+        self.hebbian.update(data.get('hebbian', {}))
+        self.neurogenesis.update(data.get('neurogenesis', {}))
+        if 'activations' in data:
+            self.activations = dict(data['activations'])
+
+class WallClock:
+    """Real time, as used by the GUI and live simulations."""
+    def now(self):
+        return time.time()
+
+    def advance(self, ticks=1):
+        pass
+
+class SimulatedClock:
+    """A clock that only moves when advanced, for headless fast-forward runs.
+
+    Each tick is ``tick_seconds`` of simulated time, so hours of learning and
+    neurogenesis intervals can be run in seconds and reproduced exactly.
+    """
+    def __init__(self, tick_seconds=1.0, start=0.0):
+        self.tick_seconds = tick_seconds
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, ticks=1):
+        self.time += ticks * self.tick_seconds
+
 class Neuron:
     """Represents a single neuron in the network."""
+    # Bumped whenever a neuron's type changes, so per-type caches (Network._activation_plan) notice
+    type_version = 0
+
     def __init__(self, name, n_type='default', position=(0,0), attributes=None):
         self.name = name
-        self.type = n_type
+        self._type = n_type
         self.position = position
         self.attributes = attributes or {}
 
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = value
+        Neuron.type_version += 1
+
     def get_position(self):
         return self.position
 
@@ -57,11 +128,40 @@ class Neuron:
         self.position = (x, y)
 
 class Connection:
-    """Represents a connection between two neurons."""
-    def __init__(self, source_name, target_name, weight=0.0):
+    """Represents a connection between two neurons.
+
+    ``owner`` is the Network the connection belongs to; it is told about weight
+    changes so incremental propagation knows which targets to recompute.
+    Hebbian weight decay is applied lazily: ``epoch`` is the owner's decay
+    epoch at which ``_weight`` was last brought up to date, and reading the
+    weight applies the decay accumulated since then.
+    """
+    # Networks hold one per edge; slots keep them small and quick to create
+    __slots__ = ('source', 'target', 'owner', '_weight', 'epoch', 'created')
+
+    def __init__(self, source_name, target_name, weight=0.0, owner=None):
         self.source = source_name
         self.target = target_name
-        self.weight = weight
+        self.owner = owner
+        self._weight = weight
+        self.epoch = owner.decay_epoch if owner is not None else 0
+        self.created = self.epoch
+
+    @property
+    def weight(self):
+        if self.owner is not None and self.epoch != self.owner.decay_epoch:
+            self._weight *= self.owner.decay_factor(self.epoch)
+            self.epoch = self.owner.decay_epoch
+        return self._weight
+
+    @weight.setter
+    def weight(self, value):
+        self._weight = value
+        if self.owner is not None:
+            self.epoch = self.owner.decay_epoch
+            self.owner._weight_changed(self.target)
+            if self.owner.journal is not None:
+                self.owner.journal.record('weights', [[self.source, self.target]], [float(value)])
 
     def get_weight(self):
         return self.weight
@@ -69,13 +169,189 @@ class Connection:
     def set_weight(self, new_weight):
         self.weight = max(-1.0, min(1.0, new_weight))
 
+@contextmanager
+def _gc_paused():
+    """Suspend the cyclic garbage collector while a bulk operation allocates many objects.
+
+    Allocating a million Connections otherwise triggers repeated full
+    collections, which find nothing to free but cost more than the
+    allocations themselves.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+class CompiledTopology:
+    """Compressed-sparse-row view of the incoming connections of a network.
+
+    Neurons are numbered in iteration order of ``neurons``. The incoming edges
+    of neuron ``i`` occupy ``indptr[i]:indptr[i+1]`` of the ``sources`` and
+    ``edges`` arrays, so one propagation step is a single pass over the edges.
+    ``edges`` holds Connection objects for dict storage and edge slots into the
+    network's ArrayStore for array storage.
+    """
+    def __init__(self, names, sources, targets, edges, network=None):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.network = network
+        order = np.argsort(targets, kind='stable')
+        counts = np.bincount(targets, minlength=len(names)).astype(np.int64)
+        self.indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        self.sources = np.asarray(sources, dtype=np.int64)[order]
+        self.targets = np.asarray(targets, dtype=np.int64)[order]
+        if network is None:
+            self.edges = [edges[i] for i in order]
+        else:
+            self.edges = np.asarray(edges, dtype=np.int64)[order]
+        # Start offsets of the non-empty rows, as required by np.add.reduceat
+        self._row_mask = counts > 0
+        self._row_starts = self.indptr[:-1][self._row_mask]
+        # Outgoing (by source) index, built on first use by incremental propagation
+        self._out_indptr = None
+        self._out_targets = None
+        self._levels = None
+        # (config key, activation code per neuron, activations), see Network._activation_plan
+        self._activation_plan = None
+
+    @classmethod
+    def from_dicts(cls, neurons, connections):
+        names = list(neurons)
+        index = {name: i for i, name in enumerate(names)}
+        sources, targets, conns = [], [], []
+        for (source, target), conn in connections.items():
+            if source in index and target in index:
+                sources.append(index[source])
+                targets.append(index[target])
+                conns.append(conn)
+        return cls(names, np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64), conns)
+
+    @classmethod
+    def from_store(cls, network):
+        store = network.store
+        n = store.num_edges
+        return cls(list(store.names), store.sources[:n], store.targets[:n], np.arange(n), network)
+
+    @property
+    def num_edges(self):
+        return len(self.edges)
+
+    def weights(self, positions=None):
+        if positions is None:
+            positions = np.arange(len(self.edges))
+        if self.network is not None:
+            return self.network._array_weights(self.edges[positions])
+        return np.fromiter((self.edges[i].get_weight() for i in positions), dtype=np.float64, count=len(positions))
+
+    def incoming(self, values, weights):
+        """Sum ``values[source] * weight`` over the incoming edges of every neuron."""
+        totals = np.zeros(len(self.names), dtype=np.float64)
+        if len(self.edges):
+            totals[self._row_mask] = np.add.reduceat(values[self.sources] * weights, self._row_starts)
+        return totals
+
+    def incoming_rows(self, values, rows):
+        """Like ``incoming`` but only for the neuron indices in ``rows``.
+
+        Each row is summed over the same edges in the same order as the full
+        sweep, so the results are bit-for-bit identical.
+        """
+        lengths = self.indptr[rows + 1] - self.indptr[rows]
+        positions = _segment_positions(self.indptr, rows)
+        totals = np.zeros(len(rows), dtype=np.float64)
+        if len(positions):
+            nonempty = lengths > 0
+            starts = (np.cumsum(lengths) - lengths)[nonempty]
+            contributions = values[self.sources[positions]] * self.weights(positions)
+            totals[nonempty] = np.add.reduceat(contributions, starts)
+        return totals
+
+    def outgoing_targets(self, rows):
+        """Indices of the neurons fed by any of the neurons in ``rows``."""
+        if self._out_indptr is None:
+            order = np.argsort(self.sources, kind='stable')
+            counts = np.bincount(self.sources, minlength=len(self.names))
+            self._out_indptr = np.zeros(len(self.names) + 1, dtype=np.int64)
+            np.cumsum(counts, out=self._out_indptr[1:])
+            self._out_targets = self.targets[order]
+        return self._out_targets[_segment_positions(self._out_indptr, rows)]
+
+    def levels(self):
+        """Neuron indices grouped by depth for an acyclic graph, or None if it has a cycle.
+
+        Level 0 holds the neurons without incoming connections; every other
+        neuron sits one level below its deepest source. Concatenated, the
+        levels are a topological order. Computed once per topology.
+        """
+        if self._levels is None:
+            remaining = np.bincount(self.targets, minlength=len(self.names))
+            frontier = np.flatnonzero(remaining == 0)
+            levels, placed = [], 0
+            while len(frontier):
+                levels.append(frontier)
+                placed += len(frontier)
+                fed = self.outgoing_targets(frontier)
+                remaining -= np.bincount(fed, minlength=len(self.names))
+                candidates = np.unique(fed)
+                frontier = candidates[remaining[candidates] == 0]
+            self._levels = levels if placed == len(self.names) else False
+        return self._levels or None
+
+def _segment_positions(indptr, rows):
+    """Concatenated ``indptr[r]:indptr[r+1]`` ranges for every row in ``rows``."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(total, dtype=np.int64)
+
 class Network:
-    """Manages all neurons, connections, and network-level operations."""
-    def __init__(self):
-        self.neurons = {}
-        self.connections = {}
-        self.state = {}
+    """Manages all neurons, connections, and network-level operations.
+
+    ``storage='array'`` keeps state and weights in an ArrayStore (with the
+    given ``dtype``); ``neurons``, ``connections`` and ``state`` are then
+    mapping views over it instead of plain dicts. ``clock`` drives the Hebbian
+    interval and neurogenesis cooldown (WallClock unless given).
+    """
+    def __init__(self, storage='dict', dtype=np.float64, clock=None):
+        self._topology = None
+        self._propagation_cache = None
+        self._dirty_targets = set()
+        self.weights_version = 0
+        self.topology_version = 0
+        # Connection weights as of the last snapshot (dict storage), see _connection_weights
+        self._weight_snapshot = None
+        self._snapshot_targets = set()
+        # Cumulative log of the Hebbian decay factors; entry e is the total up to decay epoch e
+        self.decay_epoch = 0
+        self._decay_log = np.zeros(16, dtype=np.float64)
+        # Per-neuron adjacency {name: {neighbour: None}}, built on first use
+        self._incoming = None
+        self._outgoing = None
+        self._prune_queue = deque()
+        self.last_pruned_count = 0
+        # Journal (journal.py) told about every change, if one is attached
+        self.journal = None
+        # Set by load for a Journal attached afterwards, see journal.journal_handover
+        self.journal_handover = None
+        if storage == 'dict':
+            self.store = None
+            self._neurons, self._connections, self._state = {}, {}, {}
+        elif storage == 'array':
+            self.store = ArrayStore(dtype)
+            self._neurons = NeuronView(self)
+            self._connections = ConnectionView(self)
+            self._state = StateView(self)
+        else:
+            raise ValueError(f"Unknown storage mode: {storage}")
         self.config = Config()
+        self.clock = clock or WallClock()
         self.last_hebbian_time = 0
         self.neurogenesis_enabled = True
         self.neurogenesis_data = {
@@ -83,72 +359,610 @@ class Network:
             'last_neuron_time': 0, 'new_neurons_details': {}
         }
 
+    @property
+    def neurons(self):
+        return self._neurons
+
+    @neurons.setter
+    def neurons(self, value):
+        if self.store is not None:
+            raise AttributeError("neurons cannot be reassigned with array storage")
+        self._neurons = value
+        self.invalidate_topology()
+
+    @property
+    def connections(self):
+        return self._connections
+
+    @connections.setter
+    def connections(self, value):
+        if self.store is not None:
+            self._connections.replace(value)
+        else:
+            self._connections = value
+        self.invalidate_topology()
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        if self.store is not None:
+            self._state.replace(value)
+        else:
+            self._state = value
+
+    def invalidate_topology(self):
+        """Drop cached topology. Call after editing neurons/connections dicts directly."""
+        self._incoming = None
+        self._outgoing = None
+        self._topology_changed()
+        if self.journal is not None:
+            self.journal.require_snapshot()
+
+    def _topology_changed(self):
+        self.topology_version += 1
+        self._topology = None
+        self._propagation_cache = None
+
+    def _weight_changed(self, target):
+        self.weights_version += 1
+        if self._propagation_cache is not None:
+            self._dirty_targets.add(target)
+        if self._weight_snapshot is not None:
+            self._snapshot_targets.add(target)
+
+    def compiled_topology(self):
+        if self._topology is None:
+            if self.store is not None:
+                self._topology = CompiledTopology.from_store(self)
+            else:
+                self._topology = CompiledTopology.from_dicts(self.neurons, self.connections)
+        return self._topology
+
+    def _adjacency(self):
+        if self._outgoing is None:
+            self._incoming = {name: {} for name in self.neurons}
+            self._outgoing = {name: {} for name in self.neurons}
+            for source, target in self.connections:
+                self._outgoing.setdefault(source, {})[target] = None
+                self._incoming.setdefault(target, {})[source] = None
+        return self._incoming, self._outgoing
+
+    def _link(self, source, target):
+        if self._outgoing is not None:
+            self._outgoing.setdefault(source, {})[target] = None
+            self._incoming.setdefault(target, {})[source] = None
+
+    def _unlink(self, source, target):
+        if self._outgoing is not None:
+            self._outgoing.get(source, {}).pop(target, None)
+            self._incoming.get(target, {}).pop(source, None)
+
+    def get_incoming(self, name):
+        """Names of the neurons with a connection into ``name``."""
+        return list(self._adjacency()[0].get(name, ()))
+
+    def get_outgoing(self, name):
+        """Names of the neurons ``name`` has a connection to."""
+        return list(self._adjacency()[1].get(name, ()))
+
     def add_neuron(self, name, value, position, n_type='default', attributes=None):
         if name not in self.neurons:
-            self.neurons[name] = Neuron(name, n_type, position, attributes)
-            self.state[name] = value
+            neuron = Neuron(name, n_type, position, attributes)
+            if self.store is not None:
+                self.store.add_neuron(neuron, value)
+            else:
+                self._neurons[name] = neuron
+                self._state[name] = value
+            if self._outgoing is not None:
+                self._incoming[name], self._outgoing[name] = {}, {}
+            self._topology_changed()
+            if self.journal is not None:
+                self.journal.record('add', name, float(value), position, n_type, neuron.attributes)
             return True
         return False
 
+    def add_neurons(self, names, values=0.0, positions=None, n_type='default', attributes=None):
+        """Add many neurons in one call; names already in the network are skipped, as with add_neuron.
+
+        ``values``, ``positions`` (an (n, 2) array or a sequence of pairs,
+        default (0, 0)), ``n_type`` and ``attributes`` are either one value for
+        every neuron or a sequence with one per name. Every neuron gets its own
+        copy of the attributes. Returns the number of neurons added.
+        """
+        names = list(names)
+        count = len(names)
+        if len(set(names)) != count:
+            raise ValueError("Duplicate neuron names")
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), (count,))
+        positions = [(0, 0)] * count if positions is None else np.broadcast_to(np.asarray(positions, dtype=np.float64).reshape(-1, 2), (count, 2)).tolist()
+        types = [n_type] * count if isinstance(n_type, str) else list(n_type)
+        attributes = [attributes] * count if attributes is None or isinstance(attributes, dict) else list(attributes)
+        if len(types) != count or len(attributes) != count:
+            raise ValueError("n_type and attributes need one entry per neuron")
+
+        rows = [i for i, name in enumerate(names) if name not in self.neurons]
+        neurons = [Neuron(names[i], types[i], tuple(positions[i]), dict(attributes[i] or {})) for i in rows]
+        if self.store is not None:
+            self.store.add_neurons(neurons, values[rows])
+        else:
+            self._neurons.update((neuron.name, neuron) for neuron in neurons)
+            self._state.update(zip((neuron.name for neuron in neurons), values[rows].tolist()))
+        if self._outgoing is not None:
+            for neuron in neurons:
+                self._incoming[neuron.name], self._outgoing[neuron.name] = {}, {}
+        if neurons:
+            self._topology_changed()
+            if self.journal is not None:
+                self.journal.record('add_many', [n.name for n in neurons], values[rows].tolist(), [n.position for n in neurons],
+                                    [n.type for n in neurons], [n.attributes for n in neurons], size=len(neurons))
+        return len(neurons)
+
     def connect(self, source, target, weight):
         if source in self.neurons and target in self.neurons:
-            self.connections[(source, target)] = Connection(source, target, weight)
+            if self.journal is not None:
+                self.journal.record('connect', source, target, float(weight))
+            if self.store is not None and (source, target) in self.store.edge_slots:
+                self.store.set_edge(source, target, weight, self.decay_epoch)
+                self._weight_changed(target)
+                return True
+            if self.store is not None:
+                self.store.set_edge(source, target, weight, self.decay_epoch)
+            else:
+                self._connections[(source, target)] = Connection(source, target, weight, owner=self)
+            self._link(source, target)
+            self._topology_changed()
             return True
         return False
 
+    def connect_many(self, sources, targets, weights):
+        """Connect ``sources[i]`` to ``targets[i]`` with ``weights[i]``, like repeated connect() calls.
+
+        ``weights`` may be a single number. Every name is checked before
+        anything changes; unknown ones raise a ValueError. Existing connections
+        get the new weight, and for a pair given more than once the last weight
+        wins. Returns the number of new connections.
+        """
+        sources, targets = list(sources), list(targets)
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets differ in length")
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), (len(sources),))
+        self._check_known(sources, targets)
+
+        if self.store is not None:
+            index = self.store.index
+            added = self.store.set_edges(np.fromiter(map(index.__getitem__, sources), dtype=np.int64, count=len(sources)),
+                                         np.fromiter(map(index.__getitem__, targets), dtype=np.int64, count=len(targets)),
+                                         weights, self.decay_epoch)
+        else:
+            connections, epoch, before = self._connections, self.decay_epoch, len(self._connections)
+            with _gc_paused():
+                keys = list(zip(sources, targets))
+                if not connections or connections.keys().isdisjoint(keys):
+                    # Only new pairs, as when building a network: create and insert them all at once
+                    connections.update(zip(keys, map(Connection, sources, targets, weights.tolist(), repeat(self))))
+                else:
+                    for key, weight in zip(keys, weights.tolist()):
+                        conn = connections.get(key)
+                        if conn is None:
+                            connections[key] = Connection(key[0], key[1], weight, self)
+                        else:
+                            conn._weight, conn.epoch = weight, epoch
+                    if self._weight_snapshot is not None:
+                        self._snapshot_targets.update(targets)
+            added = len(connections) - before
+        self._connected_many(added)
+        if self.journal is not None:
+            self.journal.record('connect_many', sources, targets, weights.tolist(), size=len(sources))
+        return added
+
+    def _check_known(self, sources, targets):
+        unknown = set(sources).union(targets).difference(self.neurons)
+        if unknown:
+            unknown = [name for name in dict.fromkeys(sources + targets) if name in unknown]
+            raise ValueError(f"Unknown neurons: {', '.join(map(str, unknown[:10]))}")
+
+    def _connected_many(self, added):
+        if added:
+            # Adjacency is rebuilt on demand rather than linked edge by edge
+            self._incoming = None
+            self._outgoing = None
+            self._topology_changed()
+        else:
+            self._all_weights_changed()
+
+    def connect_layers(self, sources, targets, init='uniform', rng=None, **options):
+        """Fully connect every neuron in ``sources`` to every neuron in ``targets``.
+
+        Weights come from initializers.py (``init`` is 'uniform', 'xavier' or
+        'he'; ``options`` such as ``low``/``high`` are passed on). Returns the
+        number of new connections.
+        """
+        sources, targets = list(sources), list(targets)
+        weights = initial_weights((len(sources), len(targets)), init, rng, **options).ravel()
+        if self.store is None or self.journal is not None:
+            return self.connect_many([s for s in sources for _ in targets], targets * len(sources), weights)
+        # Array storage: pairs as index arrays, without a name per connection
+        self._check_known(sources, targets)
+        index = self.store.index
+        rows = np.fromiter(map(index.__getitem__, sources), dtype=np.int64, count=len(sources))
+        cols = np.fromiter(map(index.__getitem__, targets), dtype=np.int64, count=len(targets))
+        added = self.store.set_edges(np.repeat(rows, len(cols)), np.tile(cols, len(rows)), weights, self.decay_epoch)
+        self._connected_many(added)
+        return added
+
+    def remove_connection(self, source, target):
+        key = (source, target)
+        if key not in self.connections:
+            return False
+        if self.store is not None:
+            self.store.remove_edge(key)
+        else:
+            del self._connections[key]
+        self._unlink(source, target)
+        self._topology_changed()
+        if self.journal is not None:
+            self.journal.record('disconnect', source, target)
+        return True
+
+    def remove_neuron(self, name):
+        """Remove a neuron with its connections and state, in O(degree)."""
+        if name not in self.neurons:
+            return False
+        incoming, outgoing = self._adjacency()
+        for target in list(outgoing.get(name, ())):
+            self.remove_connection(name, target)
+        for source in list(incoming.get(name, ())):
+            self.remove_connection(source, name)
+        incoming.pop(name, None)
+        outgoing.pop(name, None)
+
+        if self.store is not None:
+            # The last neuron is moved into the freed index; hand over its edges to remap
+            moved = self.store.names[-1]
+            moved_edges = [(moved, t) for t in outgoing.get(moved, ())]
+            moved_edges += [(s, moved) for s in incoming.get(moved, ()) if s != moved]
+            self.store.remove_neuron(name, incident=[], moved_edges=moved_edges)
+        else:
+            del self._neurons[name]
+            self._state.pop(name, None)
+        self._topology_changed()
+        if self.journal is not None:
+            self.journal.record('remove', name)
+        return True
+
+    def rename_neuron(self, old_name, new_name):
+        """Rename a neuron, re-keying its connections and state, in O(degree)."""
+        if old_name not in self.neurons or not new_name or new_name in self.neurons:
+            return False
+        incoming, outgoing = self._adjacency()
+        old_keys = [(old_name, t) for t in outgoing.get(old_name, ())]
+        old_keys += [(s, old_name) for s in incoming.get(old_name, ()) if s != old_name]
+        renamed = lambda n: new_name if n == old_name else n
+        new_keys = [(renamed(s), renamed(t)) for s, t in old_keys]
+
+        for source, target in old_keys:
+            self._unlink(source, target)
+        incoming.pop(old_name, None)
+        outgoing.pop(old_name, None)
+        incoming[new_name], outgoing[new_name] = {}, {}
+
+        if self.store is not None:
+            self.store.rename_neuron(old_name, new_name, old_keys, new_keys)
+        else:
+            neuron = self._neurons.pop(old_name)
+            neuron.name = new_name
+            self._neurons[new_name] = neuron
+            if old_name in self._state:
+                self._state[new_name] = self._state.pop(old_name)
+            conns = [self._connections.pop(key) for key in old_keys]
+            for (source, target), conn in zip(new_keys, conns):
+                conn.source, conn.target = source, target
+                self._connections[(source, target)] = conn
+        for source, target in new_keys:
+            self._link(source, target)
+
+        details = self.neurogenesis_data['new_neurons_details']
+        if old_name in details:
+            details[new_name] = details.pop(old_name)
+        self._topology_changed()
+        if self.journal is not None:
+            self.journal.record('rename', old_name, new_name)
+        return True
+
+    def _all_weights_changed(self):
+        self.weights_version += 1
+        self._propagation_cache = None
+
+    def decay_factor(self, epoch):
+        """Weight decay accumulated between decay epoch ``epoch`` and now."""
+        return math.exp(self._decay_log[self.decay_epoch] - self._decay_log[epoch])
+
+    def _advance_decay_epoch(self, decay):
+        # O(1): weights pick the new factor up lazily when next read
+        self._decay_log = _grow(self._decay_log, self.decay_epoch + 2)
+        self._decay_log[self.decay_epoch + 1] = self._decay_log[self.decay_epoch] + math.log(max(1.0 - decay, sys.float_info.min))
+        self.decay_epoch += 1
+        if self.journal is not None:
+            self.journal.record('decay', float(decay))
+
+    def _array_weights(self, slots):
+        # Current weights of ArrayStore edge slots, bringing stale ones up to date in place
+        store = self.store
+        stale = slots[store.epochs[slots] != self.decay_epoch]
+        if len(stale):
+            factors = np.exp(self._decay_log[self.decay_epoch] - self._decay_log[store.epochs[stale]])
+            store.weights[stale] *= factors
+            store.epochs[stale] = self.decay_epoch
+        return store.weights[slots].astype(np.float64)
+
+    def materialize_weights(self):
+        """Apply all pending lazy decay to the stored weights (done before save and render)."""
+        if self.store is not None:
+            self._array_weights(np.arange(self.store.num_edges))
+            return
+        for conn in self._connections.values():
+            conn.weight
+
+    def _get_weights(self, keys):
+        if self.store is not None:
+            return self._array_weights(np.array([self.store.edge_slots[key] for key in keys], dtype=np.int64))
+        return np.fromiter((self._connections[key].weight for key in keys), dtype=np.float64, count=len(keys))
+
+    def _get_created(self, keys):
+        if self.store is not None:
+            return self.store.created[[self.store.edge_slots[key] for key in keys]]
+        return np.fromiter((self._connections[key].created for key in keys), dtype=np.int64, count=len(keys))
+
+    def _set_weights(self, keys, weights):
+        # Bulk write without per-connection change notifications; callers follow up with _all_weights_changed()
+        if self.journal is not None:
+            self.journal.record('weights', list(keys), weights.tolist(), size=len(keys))
+        if self.store is not None:
+            slots = [self.store.edge_slots[key] for key in keys]
+            self.store.weights[slots] = weights
+            self.store.epochs[slots] = self.decay_epoch
+            return
+        for key, weight in zip(keys, weights.tolist()):
+            conn = self._connections[key]
+            conn._weight, conn.epoch = weight, self.decay_epoch
+        if self._weight_snapshot is not None:
+            self._snapshot_targets.update(key[1] for key in keys)
+
+    def prune_connections(self, max_checks=None):
+        """Remove connections whose weight has decayed below ``prune_threshold``.
+
+        Only connections at least ``prune_min_age`` learning cycles old are
+        removed. With ``max_checks`` only that many connections are examined,
+        continuing round-robin from the previous call, so the work per call
+        is bounded. Returns the number of connections removed.
+        """
+        threshold = self.config.hebbian['prune_threshold']
+        if threshold <= 0:
+            return 0
+        if max_checks is None:
+            keys = list(self.connections)
+        else:
+            if not self._prune_queue:
+                self._prune_queue.extend(self.connections)
+            keys = [self._prune_queue.popleft() for _ in range(min(max_checks, len(self._prune_queue)))]
+            keys = [key for key in keys if key in self.connections]
+        if not keys:
+            return 0
+
+        ages = self.decay_epoch - self._get_created(keys)
+        dead = (np.abs(self._get_weights(keys)) < threshold) & (ages >= self.config.hebbian['prune_min_age'])
+        for i in np.flatnonzero(dead):
+            self.remove_connection(*keys[i])
+        return int(dead.sum())
+
+    def enforce_edge_cap(self, names=None):
+        """Keep at most ``max_edges_per_neuron`` connections on each neuron in ``names``.
+
+        The weakest connections are removed first; connections younger than
+        ``prune_min_age`` are exempt. Returns the number of connections removed.
+        """
+        cap = self.config.hebbian['max_edges_per_neuron']
+        if not cap:
+            return 0
+        incoming, outgoing = self._adjacency()
+        removed = 0
+        for name in (self.neurons if names is None else names):
+            keys = [(name, t) for t in outgoing.get(name, ())]
+            keys += [(s, name) for s in incoming.get(name, ()) if s != name]
+            excess = len(keys) - cap
+            if excess <= 0:
+                continue
+            ages = self.decay_epoch - self._get_created(keys)
+            eligible = np.flatnonzero(ages >= self.config.hebbian['prune_min_age'])
+            strength = np.abs(self._get_weights(keys))[eligible]
+            for i in eligible[np.argsort(strength, kind='stable')][:excess]:
+                self.remove_connection(*keys[i])
+                removed += 1
+        return removed
+
+    def _pairs_within_cap(self, pairs, new, strength):
+        """Which of the ``new`` pairs (indices into ``pairs``) can be connected without exceeding ``max_edges_per_neuron``.
+
+        New connections count against the cap as they are created, strongest
+        first, so learning does not grow a neuron past the cap only for
+        ``enforce_edge_cap`` to prune the pair again (young connections are
+        exempt from that). Returns the indices of the pairs to create,
+        renumbered for ``pairs`` without the rejected ones, and a mask of the
+        pairs to keep.
+        """
+        cap = self.config.hebbian['max_edges_per_neuron']
+        incoming, outgoing = self._adjacency()
+        degree = {}
+        accepted = set()
+        for i in sorted(new, key=lambda i: -strength[i]):
+            pair = pairs[i]
+            for name in pair:
+                if name not in degree:
+                    degree[name] = len(outgoing.get(name, ())) + sum(1 for s in incoming.get(name, ()) if s != name)
+            if degree[pair[0]] < cap and degree[pair[1]] < cap:
+                degree[pair[0]] += 1
+                degree[pair[1]] += 1
+                accepted.add(i)
+        keep = np.ones(len(pairs), dtype=bool)
+        keep[[i for i in new if i not in accepted]] = False
+        renumbered = np.cumsum(keep) - 1
+        return renumbered[sorted(accepted)].tolist(), keep
+
     def perform_learning(self):
-        if time.time() - self.last_hebbian_time < (self.config.hebbian['learning_interval'] / 1000.0):
+        if self.clock.now() - self.last_hebbian_time < (self.config.hebbian['learning_interval'] / 1000.0):
             return None
 
-        self.last_hebbian_time = time.time()
-        active_neurons = [n for n, v in self.state.items() if v > self.config.hebbian['active_threshold']]
-        updated_pairs = set()
+        self.last_hebbian_time = self.clock.now()
+        self.last_pruned_count = 0
+        topology = self.compiled_topology()
+        values = self._state_vector(topology)
+        active = np.flatnonzero(values > self.config.hebbian['active_threshold'])
 
-        if len(active_neurons) < 2:
+        if len(active) < 2:
             return []
 
-        for i in range(len(active_neurons)):
-            for j in range(i + 1, len(active_neurons)):
-                n1, n2 = active_neurons[i], active_neurons[j]
-                v1, v2 = self.state[n1], self.state[n2]
-                lr = self.config.hebbian['base_learning_rate']
-                
-                # Strengthen connection (or create if non-existent)
-                key = tuple(sorted((n1, n2)))
-                if key not in self.connections:
-                    self.connect(key[0], key[1], 0)
-                
-                # Apply Hebbian rule
-                weight_change = lr * (v1 / 100.0) * (v2 / 100.0)
-                conn = self.connections.get(key) or self.connections.get(key[::-1])
-                if conn:
-                    new_weight = conn.get_weight() + weight_change
-                    conn.set_weight(new_weight)
-                    updated_pairs.add(key)
-        
-        # Apply weight decay
-        decay = self.config.hebbian['weight_decay']
-        for conn in self.connections.values():
-            conn.set_weight(conn.get_weight() * (1.0 - decay))
-            
-        return list(updated_pairs)
+        # Co-activity of every pair of active neurons: lr * (v1 / 100) * (v2 / 100)
+        scaled = values[active] / 100.0
+        co_activity = self.config.hebbian['base_learning_rate'] * np.outer(scaled, scaled)
+        rows, cols = np.triu_indices(len(active), 1)
+        weight_changes = co_activity[rows, cols]
 
-    def propagate_activation(self):
-        next_state = self.state.copy()
-        for target_name, target_neuron in self.neurons.items():
-            incoming_activation = 0
-            for (source_name, t_name), conn in self.connections.items():
-                if t_name == target_name:
-                    incoming_activation += self.state.get(source_name, 0) * conn.get_weight()
+        # Strengthen connection (or create if non-existent), keyed by the sorted pair of names
+        names = [topology.names[i] for i in active]
+        updated_pairs = [(names[i], names[j]) if names[i] <= names[j] else (names[j], names[i])
+                         for i, j in zip(rows.tolist(), cols.tolist())]
+        new_pairs = [i for i, key in enumerate(updated_pairs) if key not in self.connections]
+        if new_pairs and self.config.hebbian['max_edges_per_neuron']:
+            new_pairs, keep = self._pairs_within_cap(updated_pairs, new_pairs, weight_changes)
+            updated_pairs = [key for key, kept in zip(updated_pairs, keep) if kept]
+            weight_changes = weight_changes[keep]
+        for i in new_pairs:
+            self.connect(*updated_pairs[i], 0)
+
+        # Apply Hebbian rule, clamped like Connection.set_weight
+        new_weights = np.clip(self._get_weights(updated_pairs) + weight_changes, -1.0, 1.0)
+        self._set_weights(updated_pairs, new_weights)
+
+        # Apply weight decay lazily: the cost of a cycle depends on the active set, not the edge count
+        self._advance_decay_epoch(self.config.hebbian['weight_decay'])
+        self._all_weights_changed()
+
+        # Drop dead edges so long-running networks stay sparse
+        self.last_pruned_count = self.prune_connections(self.config.hebbian['prune_batch_size'])
+        self.last_pruned_count += self.enforce_edge_cap(names)
+        if self.last_pruned_count:
+            updated_pairs = [key for key in updated_pairs if key in self.connections]
             
-            # Simple activation function (e.g., tanh) scaled to 0-100
-            activation = math.tanh(incoming_activation / 100.0) # Scale input
-            next_state[target_name] = (activation + 1) * 50 # Map from [-1, 1] to [0, 100]
+        return updated_pairs
+
+    def _state_vector(self, topology):
+        if self.store is not None:
+            return self.store.state[:len(topology.names)].astype(np.float64)
+        return np.fromiter((self.state.get(name, 0) for name in topology.names),
+                           dtype=np.float64, count=len(topology.names))
 
+    def _write_state_vector(self, topology, values):
+        if self.store is not None:
+            self.store.state[:len(topology.names)] = values
+            return
+        next_state = self.state.copy()
+        next_state.update(zip(topology.names, values.tolist()))
         self.state = next_state
 
+    def is_acyclic(self):
+        return self.compiled_topology().levels() is not None
+
+    def topological_order(self):
+        """Neuron names in dependency order, or None if the graph has a cycle."""
+        topology = self.compiled_topology()
+        levels = topology.levels()
+        if levels is None:
+            return None
+        return [topology.names[i] for i in np.concatenate(levels)]
+
+    def _activation_plan(self, topology):
+        """``(codes, functions)``: each neuron's activation, as an index into ``functions``.
+
+        Rebuilt when ``config.activations`` or any neuron's type has changed;
+        the outputs kept for incremental propagation are dropped then, as
+        they were computed with the old activations.
+        """
+        key = (tuple(self.config.activations.items()), Neuron.type_version)
+        if topology._activation_plan is None or topology._activation_plan[0] != key:
+            functions = [get_activation('scaled_tanh')]
+            codes = np.zeros(len(topology.names), dtype=np.int64)
+            for i, name in enumerate(topology.names if self.config.activations else ()):
+                activation = self.config.activations.get(self.neurons[name].type)
+                if activation is not None:
+                    activation = get_activation(activation)
+                    if activation not in functions:
+                        functions.append(activation)
+                    codes[i] = functions.index(activation)
+            topology._activation_plan = (key, codes, functions)
+            self._propagation_cache = None
+        return topology._activation_plan[1:]
+
+    def _activate(self, topology, incoming, rows=None):
+        """Apply each neuron's activation to its incoming sum (last axis: neurons, or ``rows``)."""
+        codes, functions = self._activation_plan(topology)
+        if len(functions) == 1:
+            return scaled_tanh(incoming)
+        if rows is not None:
+            codes = codes[rows]
+        result = np.empty(np.shape(incoming))
+        for code, activation in enumerate(functions):
+            members = codes == code
+            if members.any():
+                result[..., members] = activation(incoming[..., members])
+        return result
+
+    def propagate_activation(self, incremental=False, topological=False):
+        """Update every neuron from its incoming connections (one synchronous step).
+
+        With ``incremental=True`` only neurons fed by state entries that changed
+        since the previous step, or whose incoming weights changed, are
+        recomputed. The result is identical to a full sweep; the first call and
+        any call after a topology change fall back to one.
+
+        With ``topological=True`` an acyclic (feed-forward) graph is evaluated
+        in a single sweep in topological order, each neuron exactly once, so
+        inputs reach the outputs in one call. Neurons without incoming
+        connections are the inputs and keep their values. Graphs with cycles
+        fall back to the synchronous step.
+        """
+        topology = self.compiled_topology()
+        self._activation_plan(topology)
+        values = self._state_vector(topology)
+        levels = topology.levels() if topological else None
+        if levels is not None:
+            for level in levels[1:]:
+                values[level] = self._activate(topology, topology.incoming_rows(values, level), level)
+            self._propagation_cache = None
+            self._write_state_vector(topology, values)
+            return
+
+        cache = self._propagation_cache
+        if incremental and cache is not None and cache['topology'] is topology:
+            changed = np.flatnonzero(values != cache['inputs'])
+            rows = topology.outgoing_targets(changed)
+            if self._dirty_targets:
+                dirty = [topology.index[n] for n in self._dirty_targets if n in topology.index]
+                rows = np.concatenate([rows, np.array(dirty, dtype=np.int64)])
+            rows = np.unique(rows)
+            outputs = cache['outputs'].copy()
+            outputs[rows] = self._activate(topology, topology.incoming_rows(values, rows), rows)
+        else:
+            outputs = self._activate(topology, topology.incoming(values, topology.weights()))
+
+        self._dirty_targets.clear()
+        self._propagation_cache = {'topology': topology, 'inputs': values, 'outputs': outputs}
+        self._write_state_vector(topology, outputs)
+
     def check_neurogenesis(self, sim_state):
-        if not self.neurogenesis_enabled or time.time() - self.neurogenesis_data['last_neuron_time'] < self.config.neurogenesis['cooldown']:
+        if not self.neurogenesis_enabled or self.clock.now() - self.neurogenesis_data['last_neuron_time'] < self.config.neurogenesis['cooldown']:
             return None
             
         # Update counters from simulated state
@@ -165,7 +979,7 @@ class Network:
             if is_triggered:
                 new_neuron_name = self._create_neuron_internal(n_type, sim_state)
                 if new_neuron_name:
-                    self.neurogenesis_data['last_neuron_time'] = time.time()
+                    self.neurogenesis_data['last_neuron_time'] = self.clock.now()
                     self.neurogenesis_data[f'{n_type}_counter'] = 0 # Reset counter
                     return new_neuron_name
         return None
@@ -192,58 +1006,261 @@ class Network:
 
         self.add_neuron(new_name, 50.0, new_pos, n_type, attrs)
         self.neurogenesis_data['new_neurons_details'][new_name] = {
-            'created_at': time.time(),
+            'created_at': self.clock.now(),
             'trigger_type': n_type,
             'associated_state_snapshot': {k:v for k,v in creation_context_state.items() if k.startswith("SIM_")}
         }
         return new_name
 
+    def run(self, ticks, sim_state=None, incremental=False, callback=None):
+        """Headless simulation driver.
+
+        Every tick propagates activation, then runs Hebbian learning and
+        neurogenesis as their configured interval and cooldown allow, then
+        advances the clock by one tick. With a SimulatedClock this
+        fast-forwards simulated time as quickly as the network can be updated.
+
+        ``sim_state`` supplies the ``SIM_*`` values for neurogenesis: a dict, or
+        a callable ``sim_state(tick, network)`` returning one (None skips
+        neurogenesis). ``callback(tick, network)`` is called after each tick;
+        returning False stops the run. Returns a summary of what happened.
+        """
+        summary = {'ticks': 0, 'learning_cycles': 0, 'pairs_updated': 0, 'pruned': 0, 'new_neurons': []}
+        for tick in range(ticks):
+            self.propagate_activation(incremental=incremental)
+
+            updated_pairs = self.perform_learning()
+            if updated_pairs is not None:
+                summary['learning_cycles'] += 1
+                summary['pairs_updated'] += len(updated_pairs)
+                summary['pruned'] += self.last_pruned_count
+
+            if sim_state is not None:
+                sim_values = sim_state(tick, self) if callable(sim_state) else sim_state
+                new_neuron_name = self.check_neurogenesis({**self.state, **sim_values})
+                if new_neuron_name:
+                    summary['new_neurons'].append(new_neuron_name)
+
+            self.clock.advance()
+            summary['ticks'] += 1
+            if callback and callback(tick, self) is False:
+                break
+        return summary
+
     def set_neurogenesis_enabled(self, enabled):
         self.neurogenesis_enabled = enabled
 
-    def save(self, filepath):
+    def save(self, filepath, share_attributes=False):
+        """Save the network as JSON, or in the binary format of formats.py if ``filepath`` ends in .npz.
+
+        JSON files ending in .gz, .bz2 or .xz (``brain.json.gz``) are
+        compressed while they are written. With ``share_attributes``
+        each distinct neuron attribute dict is stored once, in an
+        ``attribute_table`` that the neurons refer to by index (files that
+        older versions cannot read).
+
+        Every save stores a new random ``snapshot_id`` in the file, which
+        ties a journal to it. A full save supersedes the journal next to
+        ``filepath``: an attached Journal for that file starts over, any other
+        one is deleted.
+        """
+        snapshot_id = uuid.uuid4().hex
+        if is_binary_path(filepath):
+            try:
+                arrays, meta = self._to_arrays()
+                meta['snapshot_id'] = snapshot_id
+                # Through a temporary file: with array storage the edge arrays may be mapped from filepath itself
+                write_replacing(filepath, write_npz, arrays, meta)
+                self._snapshot_written(filepath, snapshot_id)
+                return True
+            except Exception as e:
+                print(f"Error saving network: {e}")
+                return False
+        self.materialize_weights()
         data = {
             'neurons': {name: {'type': n.type, 'position': n.position, 'attributes': n.attributes} for name, n in self.neurons.items()},
             'connections': {f"{s}->{t}": c.get_weight() for (s, t), c in self.connections.items()},
-            'state': self.state,
-            'config': {
-                'hebbian': self.config.hebbian,
-                'neurogenesis': self.config.neurogenesis,
-            }
+            'state': dict(self.state),
+            'config': self.config.to_dict(),
+            'snapshot_id': snapshot_id,
         }
+        if share_attributes:
+            data['neurons'], data['attribute_table'] = attribute_table(data['neurons'])
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=4)
+            with open_text(filepath, 'w') as f:
+                if compression_of(filepath):
+                    json.dump(data, f, separators=(',', ':'))
+                else:
+                    json.dump(data, f, indent=4)
+            self._snapshot_written(filepath, snapshot_id)
             return True
         except Exception as e:
             print(f"Error saving network: {e}")
             return False
 
+    def _snapshot_written(self, filepath, snapshot_id):
+        if self.journal is not None and self.journal.snapshot_path == os.path.abspath(filepath):
+            self.journal.reset(snapshot_id)
+        elif os.path.exists(journal_path(filepath)):
+            os.remove(journal_path(filepath))
+
+    def snapshot(self):
+        """A copy of the network's neurons, connections, state and config as ``(arrays, meta)``.
+
+        The copy stays valid while the network keeps changing, so it can be
+        written out on another thread with ``formats.write_npz``/``write_json``.
+        With array storage this is a handful of array copies.
+        """
+        arrays, meta = self._to_arrays()
+        return {name: np.array(array) for name, array in arrays.items()}, json.loads(json.dumps(meta))
+
+    def _to_arrays(self):
+        """The network as the arrays and metadata of a binary network file."""
+        names = list(self.neurons)
+        neurons = [self.neurons[name] for name in names]
+        types = list(dict.fromkeys(n.type for n in neurons))
+        type_index = {n_type: i for i, n_type in enumerate(types)}
+        if self.store is not None:
+            self.materialize_weights()
+            store, count = self.store, self.store.num_edges
+            sources, targets, weights = store.sources[:count], store.targets[:count], store.weights[:count]
+            state = store.state[:store.num_neurons]
+        else:
+            # The compiled topology already numbers the connections (and is usually cached)
+            topology = self.compiled_topology()
+            sources, targets = topology.sources.astype(np.int32), topology.targets.astype(np.int32)
+            weights = self._connection_weights(topology)
+            state = np.fromiter((self.state.get(name, 0.0) for name in names), dtype=np.float64, count=len(names))
+        arrays = {
+            'names': np.array(names, dtype=str),
+            'types': np.array(types, dtype=str),
+            'neuron_types': np.fromiter((type_index[n.type] for n in neurons), dtype=np.int32, count=len(names)),
+            'positions': np.array([n.position for n in neurons], dtype=np.float64).reshape(len(names), 2),
+            'state': state,
+            'sources': sources,
+            'targets': targets,
+            'weights': weights,
+        }
+        meta = {
+            'config': self.config.to_dict(),
+            'attributes': {str(i): n.attributes for i, n in enumerate(neurons) if n.attributes},
+            'extra_state': {name: value for name, value in self.state.items() if name not in self.neurons},
+        }
+        return arrays, meta
+
+    def _connection_weights(self, topology):
+        """Current weights of the connections of ``topology`` (dict storage), without changing them.
+
+        The stored weights and decay epochs are kept from one call to the
+        next; while the topology stays the same, only the connections into
+        neurons whose weights were written since are read again, and the
+        pending decay is applied to the arrays in one step. (Reading
+        ``Connection.weight`` may have applied it in several, so the two can
+        differ in the last bit.)
+        """
+        edges, cached = topology.edges, self._weight_snapshot
+        if cached is None or cached[0] is not topology:
+            raw = np.fromiter((conn._weight for conn in edges), dtype=np.float64, count=len(edges))
+            epochs = np.fromiter((conn.epoch for conn in edges), dtype=np.int64, count=len(edges))
+        else:
+            _, raw, epochs = cached
+            rows = np.array([topology.index[name] for name in self._snapshot_targets if name in topology.index], dtype=np.int64)
+            positions = _segment_positions(topology.indptr, rows).tolist()
+            raw[positions] = np.fromiter((edges[i]._weight for i in positions), dtype=np.float64, count=len(positions))
+            epochs[positions] = np.fromiter((edges[i].epoch for i in positions), dtype=np.int64, count=len(positions))
+        self._snapshot_targets.clear()
+        self._weight_snapshot = (topology, raw, epochs)
+        # One factor per distinct epoch, computed as Connection.weight does
+        stale = np.unique(epochs[epochs != self.decay_epoch])
+        if not len(stale):
+            return raw.copy()
+        factors = np.ones(self.decay_epoch + 1)
+        factors[stale] = [self.decay_factor(epoch) for epoch in stale.tolist()]
+        return raw * factors[epochs]
+
     @staticmethod
-    def load(filepath):
-        try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            
-            net = Network()
-            # Load config first
-            if 'config' in data:
-                net.config.hebbian.update(data['config'].get('hebbian', {}))
-                net.config.neurogenesis.update(data['config'].get('neurogenesis', {}))
-            
-            # Load neurons
-            for name, n_data in data['neurons'].items():
-                net.add_neuron(name, 0, n_data['position'], n_data['type'], n_data.get('attributes'))
-            
-            # Load connections
-            for key, weight in data['connections'].items():
-                source, target = key.split('->')
-                net.connect(source, target, weight)
-            
-            # Load state
-            net.state = data.get('state', {n: 50.0 for n in net.neurons})
+    def _from_arrays(arrays, meta, storage='dict', dtype=np.float64):
+        """Build a network from the contents of a binary network file without per-connection connect() calls."""
+        net = Network(storage, dtype)
+        net.config.update(meta['config'])
+        names = arrays['names'].tolist()
+        types = arrays['types'].tolist()
+        attributes = meta.get('attributes', {})
+        neurons = [Neuron(name, types[t], tuple(position), attributes.get(str(i)))
+                   for i, (name, t, position) in enumerate(zip(names, arrays['neuron_types'].tolist(), arrays['positions'].tolist()))]
+        sources, targets, weights = arrays['sources'], arrays['targets'], arrays['weights']
+        if net.store is not None:
+            store = net.store
+            store.names = names
+            store.index = {name: i for i, name in enumerate(names)}
+            store.neuron_objects = neurons
+            store.state = arrays['state'].astype(store.dtype)
+            # Memory-mapped edge arrays are used as they are; they are copied when the store grows
+            store.sources = sources.astype(np.int32, copy=False)
+            store.targets = targets.astype(np.int32, copy=False)
+            store.weights = weights.astype(store.dtype, copy=False)
+            store.epochs = np.zeros(len(sources), dtype=np.int64)
+            store.created = np.zeros(len(sources), dtype=np.int64)
+            store.drop_edge_index(len(sources))
+        else:
+            source_names = list(map(names.__getitem__, sources.tolist()))
+            target_names = list(map(names.__getitem__, targets.tolist()))
+            keys = list(zip(source_names, target_names))
+            net._neurons = dict(zip(names, neurons))
+            net._state = dict(zip(names, arrays['state'].tolist()))
+            with _gc_paused():
+                net._connections = dict(zip(keys, map(Connection, source_names, target_names, weights.tolist(), repeat(net))))
+        net.state.update(meta.get('extra_state', {}))
+        net.invalidate_topology()
+        return net
+
+    @staticmethod
+    def load(filepath, storage='dict', dtype=np.float64, mmap=True, journal=True):
+        """Load a network saved by ``save``; .npz files are memory-mapped unless ``mmap`` is False.
 
+        With ``journal`` the changes logged next to the file (see journal.py)
+        are replayed on top of it, and a Journal attached to the network
+        afterwards keeps appending to them.
+        """
+        try:
+            if is_binary_path(filepath):
+                arrays, meta = read_npz(filepath, mmap)
+                net = Network._from_arrays(arrays, meta, storage, dtype)
+                snapshot_id = meta.get('snapshot_id')
+            else:
+                net, snapshot_id = Network._from_json(filepath, storage, dtype)
+            if journal:
+                replay_journal(net, filepath, snapshot_id)
+                net.journal_handover = journal_handover(net, filepath, snapshot_id)
             return net
         except Exception as e:
             print(f"Error loading network: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def _from_json(filepath, storage, dtype):
+        with open_text(filepath) as f:
+            data = json.load(f)
+        
+        net = Network(storage, dtype)
+        # Load config first
+        if 'config' in data:
+            net.config.update(data['config'])
+        
+        # Load neurons (attributes may be indices into a shared table)
+        neurons = data['neurons']
+        table = data.get('attribute_table', [])
+        attributes = [n_data.get('attributes') for n_data in neurons.values()]
+        attributes = [table[a] if isinstance(a, int) else a for a in attributes]
+        net.add_neurons(neurons, 0, [n_data['position'] for n_data in neurons.values()],
+                        [n_data['type'] for n_data in neurons.values()], attributes)
+        
+        # Load connections; those to or from a neuron missing from the file are skipped, as connect() does
+        pairs = [(key.split('->'), weight) for key, weight in data['connections'].items()]
+        pairs = [((s, t), weight) for (s, t), weight in pairs if s in net.neurons and t in net.neurons]
+        net.connect_many([s for (s, _), _ in pairs], [t for (_, t), _ in pairs], [weight for _, weight in pairs])
+        
+        # Load state
+        net.state = data.get('state', {n: 50.0 for n in net.neurons})
+
+        return net, data.get('snapshot_id')
\ No newline at end of file
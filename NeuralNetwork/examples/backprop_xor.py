@@ -70,18 +70,18 @@ def main():
     
     # Test the trained network
     print("\nTesting trained network (normalized inputs/outputs):")
-    correct_predictions = 0
-    for inputs_norm, expected_norm in training_data_normalized:
-        actual_outputs_norm = backprop_learner.forward_pass(inputs_norm)
+    test_inputs = [inputs_norm for inputs_norm, _ in training_data_normalized]
+    test_targets = [expected_norm for _, expected_norm in training_data_normalized]
+    # One vectorized call for all samples
+    actual_outputs = backprop_learner.predict(test_inputs)
+    for inputs_norm, expected_norm, actual_outputs_norm in zip(test_inputs, test_targets, actual_outputs):
         predicted_binary = 1 if actual_outputs_norm[0] > 0.5 else 0
         expected_binary = 1 if expected_norm[0] > 0.5 else 0
         print(f"  Input: {inputs_norm}, Raw Output: [{actual_outputs_norm[0]:.4f}], "
               f"Predicted Binary: {predicted_binary}, Expected Binary: {expected_binary}")
-        if predicted_binary == expected_binary:
-            correct_predictions += 1
             
-    accuracy = (correct_predictions / len(training_data_normalized)) * 100
-    print(f"\nAccuracy on training data: {accuracy:.2f}%")
+    results = backprop_learner.evaluate(test_inputs, test_targets)
+    print(f"\nAccuracy on training data: {results['accuracy'] * 100:.2f}% (MSE {results['mse']:.7f})")
     
     # Plot training error
     if epoch_errors_history:
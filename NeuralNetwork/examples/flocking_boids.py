@@ -12,6 +12,34 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from NeuralNetwork.core import Network, Config
+from NeuralNetwork.batch import BatchEvaluator
+
+BRAIN_INPUTS = ['avg_flock_x', 'avg_flock_y', 'avg_heading_x', 'avg_heading_y', 'sep_x', 'sep_y']
+BRAIN_OUTPUTS = ['accel_x', 'accel_y']
+
+def create_brain():
+    """ Creates the simple neural network shared by every boid. """
+    net = Network()
+    # Inputs: avg_flock_x, avg_flock_y, avg_heading_x, avg_heading_y, avg_separation_x, avg_separation_y
+    # Outputs: acceleration_x, acceleration_y
+    for name in BRAIN_INPUTS:
+        net.add_neuron(name, 0, (0, 0), n_type='input')
+    for name in BRAIN_OUTPUTS:
+        net.add_neuron(name, 0, (0, 0), n_type='output')
+
+    # A simple brain: directly connect inputs to outputs
+    for i_name in BRAIN_INPUTS:
+        for o_name in BRAIN_OUTPUTS:
+            # Weights are tuned to produce classic flocking behavior
+            weight = 0
+            if (i_name.startswith('avg_flock') and o_name.endswith(i_name[-1])): # Cohesion
+                weight = 0.6
+            elif (i_name.startswith('avg_heading') and o_name.endswith(i_name[-1])): # Alignment
+                weight = 0.5
+            elif (i_name.startswith('sep') and o_name.endswith(i_name[-1])): # Separation
+                weight = 1.2 # Strongest influence
+            net.connect(i_name, o_name, weight)
+    return net
 
 # --- Boid Class ---
 class Boid:
@@ -25,38 +53,8 @@ class Boid:
         self.max_speed = 2.5
         self.max_force = 0.05
         
-        # Each boid has its own simple neural network
-        self.network = self.create_brain()
-
-    def create_brain(self):
-        """ Creates a simple neural network for the boid. """
-        net = Network()
-        # Inputs: avg_flock_x, avg_flock_y, avg_heading_x, avg_heading_y, avg_separation_x, avg_separation_y
-        inputs = ['avg_flock_x', 'avg_flock_y', 'avg_heading_x', 'avg_heading_y', 'sep_x', 'sep_y']
-        # Outputs: acceleration_x, acceleration_y
-        outputs = ['accel_x', 'accel_y']
-        
-        for name in inputs:
-            net.add_neuron(name, 0, n_type='input')
-        for name in outputs:
-            net.add_neuron(name, 0, n_type='output')
-            
-        # A simple brain: directly connect inputs to outputs
-        for i_name in inputs:
-            for o_name in outputs:
-                # Weights are tuned to produce classic flocking behavior
-                weight = 0
-                if (i_name.startswith('avg_flock') and o_name.endswith(i_name[-1])): # Cohesion
-                    weight = 0.6
-                elif (i_name.startswith('avg_heading') and o_name.endswith(i_name[-1])): # Alignment
-                    weight = 0.5
-                elif (i_name.startswith('sep') and o_name.endswith(i_name[-1])): # Separation
-                    weight = 1.2 # Strongest influence
-                net.connect(i_name, o_name, weight)
-        return net
-
-    def update(self, boids):
-        """ Update the boid's state based on the flock. """
+    def sense(self, boids):
+        """ Returns the brain inputs (in BRAIN_INPUTS order) for the local flock dynamics. """
         perception_radius = 50
         
         # --- Calculate local flock dynamics ---
@@ -81,7 +79,7 @@ class Boid:
                 
                 total_in_perception += 1
 
-        # --- Feed inputs into the neural network ---
+        # --- Build the neural network inputs ---
         if total_in_perception > 0:
             # Cohesion vector
             avg_pos /= total_in_perception
@@ -93,25 +91,16 @@ class Boid:
             # Separation vector
             separation_force /= total_in_perception
 
-            # Set network inputs (normalized)
-            self.network.state['avg_flock_x'] = (cohesion_steer.x() / perception_radius)
-            self.network.state['avg_flock_y'] = (cohesion_steer.y() / perception_radius)
-            self.network.state['avg_heading_x'] = avg_vel.x()
-            self.network.state['avg_heading_y'] = avg_vel.y()
-            self.network.state['sep_x'] = separation_force.x()
-            self.network.state['sep_y'] = separation_force.y()
-        else:
-            # No neighbors, no input
-            for name in self.network.neurons: self.network.state[name] = 0
-
-        # Propagate through the network to get desired acceleration
-        self.network.propagate_activation()
-        
-        # --- Apply the network's output ---
-        accel = QtCore.QPointF(
-            self.network.state.get('accel_x', 0),
-            self.network.state.get('accel_y', 0)
-        )
+            # Network inputs (normalized)
+            return [cohesion_steer.x() / perception_radius, cohesion_steer.y() / perception_radius,
+                    avg_vel.x(), avg_vel.y(),
+                    separation_force.x(), separation_force.y()]
+        # No neighbors, no input
+        return [0.0] * len(BRAIN_INPUTS)
+
+    def apply(self, accel_x, accel_y):
+        """ Steer with the acceleration chosen by the brain and move. """
+        accel = QtCore.QPointF(accel_x, accel_y)
         
         # Limit the force
         if accel.manhattanLength() > self.max_force:
@@ -149,6 +138,12 @@ class FlockingWindow(QtWidgets.QMainWindow):
         
         self.flock = []
         self.boid_items = []
+
+        # Every boid has the same brain, so the whole flock is evaluated in one batch
+        self.brain = create_brain()
+        self.brain_eval = BatchEvaluator(self.brain)
+        self.input_cols = self.brain_eval.columns(BRAIN_INPUTS)
+        self.output_cols = self.brain_eval.columns(BRAIN_OUTPUTS)
         
         self.setup_flock(100)
         
@@ -176,8 +171,11 @@ class FlockingWindow(QtWidgets.QMainWindow):
             self.boid_items.append(item)
 
     def update_simulation(self):
-        for boid in self.flock:
-            boid.update(self.flock)
+        states = self.brain_eval.new_states(len(self.flock))
+        states[:, self.input_cols] = [boid.sense(self.flock) for boid in self.flock]
+        outputs = self.brain_eval.step(states)[:, self.output_cols]
+        for boid, (accel_x, accel_y) in zip(self.flock, outputs.tolist()):
+            boid.apply(accel_x, accel_y)
             
         self.draw_flock()
 
@@ -0,0 +1,56 @@
+import sys
+import os
+import time
+import random
+import numpy as np
+
+# --- Add Project Root to sys.path ---
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from NeuralNetwork.core import Network
+from NeuralNetwork.learning import BackpropNetwork, Dataset
+
+LAYER_SIZES = [256, 128, 10]
+SAMPLES = 20000
+BATCH_SIZE = 2048
+EPOCHS = 5
+
+def create_learner(seed):
+    """ A fully connected 256-128-10 network with reproducible random weights. """
+    rng = random.Random(seed)
+    net = Network()
+    layers = [[f"L{i}_{j}" for j in range(size)] for i, size in enumerate(LAYER_SIZES)]
+    for layer in layers:
+        for name in layer:
+            net.add_neuron(name, 0, (0, 0))
+    for prev_layer, next_layer in zip(layers, layers[1:]):
+        for source in prev_layer:
+            for target in next_layer:
+                net.connect(source, target, rng.uniform(-0.1, 0.1))
+    learner = BackpropNetwork(net, learning_rate=0.5, momentum_factor=0.5)
+    learner.set_layers(layers)
+    return learner
+
+def main():
+    print(f"Data-parallel training benchmark: {'-'.join(map(str, LAYER_SIZES))} network, "
+          f"{SAMPLES} samples, batch size {BATCH_SIZE}, {EPOCHS} epochs, {os.cpu_count()} CPUs")
+    rng = np.random.default_rng(0)
+    data = Dataset(LAYER_SIZES[0], LAYER_SIZES[-1], capacity=SAMPLES)
+    data.extend(rng.random((SAMPLES, LAYER_SIZES[0])), np.eye(LAYER_SIZES[-1])[rng.integers(0, LAYER_SIZES[-1], SAMPLES)])
+
+    worker_counts = [1] + [n for n in (2, 4, 8, 16) if n <= (os.cpu_count() or 1)]
+    baseline = None
+    for workers in worker_counts:
+        learner = create_learner(seed=1)
+        start = time.perf_counter()
+        errors = learner.train(data, epochs=EPOCHS, target_error_threshold=0, batch_size=BATCH_SIZE, seed=42, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"  workers={workers:2d}: {elapsed:7.2f} s  ({SAMPLES * EPOCHS / elapsed:9.0f} samples/s, "
+              f"speed-up x{baseline / elapsed:.2f}, final error {errors[-1]:.5f})")
+    print("Times include starting the worker processes.")
+
+if __name__ == "__main__":
+    main()
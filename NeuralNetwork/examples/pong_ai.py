@@ -9,7 +9,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from NeuralNetwork.core import Network
-from NeuralNetwork.learning import BackpropNetwork # We need the backprop learner
+from NeuralNetwork.learning import BackpropNetwork, Dataset # We need the backprop learner
 
 # --- Game Object Classes ---
 class Paddle(QtWidgets.QGraphicsRectItem):
@@ -88,7 +88,7 @@ class PongGame(QtWidgets.QMainWindow):
     def train_ai(self):
         """ Generate training data from a 'perfect' algorithm and train the network. """
         print("Training AI...")
-        training_data = []
+        training_data = Dataset(num_inputs=3, num_outputs=1, capacity=2000)
         # Generate 2000 examples
         for _ in range(2000):
             # Simulate random game states
@@ -105,10 +105,12 @@ class PongGame(QtWidgets.QMainWindow):
 
             inputs = [ball_y / self.game_height, ball_dy / 5, paddle_y / self.game_height]
             outputs = [perfect_move]
-            training_data.append((inputs, outputs))
+            training_data.append(inputs, outputs)
             
         # Train the network
         self.backprop_learner.train(training_data, epochs=100, target_error_threshold=0.01)
+        # Per-frame decisions use a frozen copy of the trained weights
+        self.ai_model = self.backprop_learner.freeze()
         print("AI Training complete.")
         
     def game_loop(self):
@@ -142,7 +144,7 @@ class PongGame(QtWidgets.QMainWindow):
         ]
         
         # Get the network's decision
-        output = self.backprop_learner.forward_pass(inputs)[0] # Get the single output value
+        output = self.ai_model.predict(inputs)[0] # Get the single output value
         
         # Interpret the output
         if output < 0.45: # Move up
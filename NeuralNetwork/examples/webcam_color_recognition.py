@@ -14,14 +14,16 @@ if grandparent_dir not in sys.path:
 
 from NeuralNetwork.core import Network, Config
 from NeuralNetwork.visualization import NetworkVisualization
-from NeuralNetwork.learning import BackpropNetwork
+from NeuralNetwork.learning import BackpropNetwork, Dataset
+from NeuralNetwork.training_worker import TrainingWorker
 
 class WebcamColorApp(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
         self.network = None 
         self.backprop_learner = None
-        self.training_data_normalized = [] 
+        self.training_data_normalized = Dataset(num_inputs=3, num_outputs=5) 
+        self.training_worker = None
         self.setup_network() 
         self.setup_ui()      
         self.setup_webcam()
@@ -110,14 +112,15 @@ class WebcamColorApp(QtWidgets.QMainWindow):
 
     def randomize_network_weights(self):
         if self.network:
+            self.stop_training(discard=True) # the run's trained weights would otherwise replace the random ones
             for conn_key in self.network.connections: self.network.connections[conn_key].set_weight(random.uniform(-0.3,0.3))
             self.vis.update(); self.statusBar().showMessage("Network weights randomized.")
-            if self.backprop_learner: self.backprop_learner.previous_weight_updates={}
+            if self.backprop_learner: self.backprop_learner.reset_optimizer()
 
     def reset_network_action(self):
         if QtWidgets.QMessageBox.question(self,"Reset","Reset weights & clear samples?",QtWidgets.QMessageBox.Yes|QtWidgets.QMessageBox.No,QtWidgets.QMessageBox.No)==QtWidgets.QMessageBox.Yes:
             self.randomize_network_weights()
-            self.training_data_normalized=[]; self.training_samples_count_label.setText(f"Samples: {len(self.training_data_normalized)}")
+            self.training_data_normalized.clear(); self.training_samples_count_label.setText(f"Samples: {len(self.training_data_normalized)}")
             self.statusBar().showMessage("Network weights randomized & samples cleared.")
 
     def setup_webcam(self):
@@ -179,30 +182,33 @@ class WebcamColorApp(QtWidgets.QMainWindow):
             target_out_norm[target_idx]=1.0
         except ValueError:
             QtWidgets.QMessageBox.warning(self,"Sampling Error",f"Target neuron {target_color_name} not found.");return
-        self.training_data_normalized.append((norm_rgb_in,target_out_norm))
+        self.training_data_normalized.append(norm_rgb_in,target_out_norm)
         self.training_samples_count_label.setText(f"Samples: {len(self.training_data_normalized)}")
         self.statusBar().showMessage(f"Sampled RGB ({r},{g},{b}) as '{target_color_label.capitalize()}'. Total: {len(self.training_data_normalized)}",5000)
 
     def train_network_on_samples(self):
         if not self.training_data_normalized:QtWidgets.QMessageBox.information(self,"Training","No samples.");return
+        if self.training_worker and self.training_worker.isRunning():return
         epochs=200;target_error=0.01
-        self.setEnabled(False)
-        progress=QtWidgets.QProgressDialog("Training network...","Cancel",0,epochs,self)
-        progress.setWindowModality(QtCore.Qt.WindowModal);progress.show()
-        epoch_errors_hist=[]
-        def cb(epoch,avg_error):
-            progress.setValue(epoch+1);progress.setLabelText(f"Epoch {epoch+1}/{epochs},AvgErr:{avg_error:.5f}")
-            QtWidgets.QApplication.processEvents();return not progress.wasCanceled()
-        try:
-            epoch_errors_hist=self.backprop_learner.train(self.training_data_normalized,epochs=epochs,target_error_threshold=target_error,progress_callback=cb)
+        progress=QtWidgets.QProgressDialog("Training network...","Cancel",0,epochs,self);progress.show()
+        # Train on a background thread so the camera feed and live recognition keep running
+        worker=self.training_worker=TrainingWorker(self.backprop_learner,self.training_data_normalized,keep_on_cancel=True,parent=self,epochs=epochs,target_error_threshold=target_error)
+        def on_progress(epoch,avg_error):progress.setValue(epoch+1);progress.setLabelText(f"Epoch {epoch+1}/{epochs},AvgErr:{avg_error:.5f}")
+        def on_completed(epoch_errors_hist):
             final_err=epoch_errors_hist[-1] if epoch_errors_hist else float('inf')
-            if progress.wasCanceled():self.statusBar().showMessage("Training cancelled.")
+            if worker.was_cancelled():self.statusBar().showMessage("Training cancelled.")
             else:progress.setValue(epochs);self.statusBar().showMessage(f"Training complete. Final avg err:{final_err:.5f}",10000)
-        except Exception as e:QtWidgets.QMessageBox.critical(self,"Training Error",f"Error: {e}");self.statusBar().showMessage(f"Training failed:{e}")
-        finally:self.setEnabled(True);progress.close();self.vis.update()
+        def on_failed(e):QtWidgets.QMessageBox.critical(self,"Training Error",f"Error: {e}");self.statusBar().showMessage(f"Training failed:{e}")
+        worker.progress.connect(on_progress);worker.completed.connect(on_completed);worker.failed.connect(on_failed)
+        progress.canceled.connect(worker.cancel);worker.finished.connect(progress.close);worker.finished.connect(self.vis.update)
+        worker.start()
+
+    def stop_training(self,discard=False):
+        # Also after the thread ended: its weights are only swapped in once the GUI thread gets to it
+        if self.training_worker:self.training_worker.cancel(discard);self.training_worker.wait()
 
     def closeEvent(self,event):
-        self.timer.stop()
+        self.timer.stop();self.stop_training()
         if hasattr(self,'cap')and self.cap and self.cap.isOpened():self.cap.release()
         cv2.destroyAllWindows();event.accept()
 
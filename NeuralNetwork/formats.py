@@ -0,0 +1,159 @@
+# NeuralNetwork/formats.py
+import os
+import bz2
+import gzip
+import json
+import lzma
+import struct
+import zipfile
+import numpy as np
+
+FORMAT_VERSION = 1
+BINARY_EXTENSIONS = ('.npz',)
+# Streaming compressors for JSON network files, by the last extension (brain.json.gz)
+COMPRESSIONS = {'.gz': gzip, '.bz2': bz2, '.xz': lzma, '.lzma': lzma}
+# gzip's default level 9 is about four times slower than 6 for a few percent smaller files
+_COMPRESSION_OPTIONS = {gzip: {'compresslevel': 6}}
+
+# Fixed part of a zip local file header; the name and extra field lengths are its last two fields
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+def is_binary_path(filepath):
+    """True if ``filepath`` names a binary network file (by its extension)."""
+    return str(filepath).lower().endswith(BINARY_EXTENSIONS)
+
+def compression_of(filepath):
+    """The compression module (gzip, bz2 or lzma) that ``filepath``'s extension asks for, or None."""
+    return COMPRESSIONS.get(os.path.splitext(os.fspath(filepath))[1].lower())
+
+def open_text(filepath, mode='r', compression=None):
+    """Open a JSON network file for streaming text I/O.
+
+    ``compression`` defaults to the one named by the extension; compressed
+    files are (de)compressed as they are read or written.
+    """
+    compression = compression or compression_of(filepath)
+    if compression is None:
+        return open(filepath, mode)
+    return compression.open(filepath, mode + 't', encoding='utf-8', **_COMPRESSION_OPTIONS.get(compression, {}))
+
+def attribute_table(neurons):
+    """Replace the ``attributes`` of neuron entries by indices into a table of the distinct dicts.
+
+    ``neurons`` maps names to the ``{'type', 'position', 'attributes'}``
+    entries of a JSON network file; returns ``(neurons, table)``.
+    """
+    index, table, shared = {}, [], {}
+    for name, entry in neurons.items():
+        key = json.dumps(entry['attributes'], sort_keys=True)
+        if key not in index:
+            index[key] = len(table)
+            table.append(entry['attributes'])
+        shared[name] = dict(entry, attributes=index[key])
+    return shared, table
+
+def write_replacing(filepath, write, *args):
+    """Call ``write(temporary, *args)`` and move the temporary file over ``filepath`` in one rename.
+
+    ``filepath`` always holds a complete file, and a network memory-mapped
+    from the old file keeps reading the old data instead of a file being
+    truncated under it.
+    """
+    temporary = os.fspath(filepath) + '.tmp'
+    try:
+        write(temporary, *args)
+        with open(temporary, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(temporary, filepath)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def write_npz(filepath, arrays, meta):
+    """Write a binary network file.
+
+    The file is an uncompressed ``.npz`` archive, readable with ``np.load``:
+
+    * ``names``: neuron names (unicode), in neuron index order
+    * ``types`` / ``neuron_types``: the distinct neuron types and an int32
+      index into them per neuron
+    * ``positions``: float64 (neurons x 2)
+    * ``state``: activation per neuron
+    * ``sources`` / ``targets``: int32 neuron indices per connection
+    * ``weights``: weight per connection
+    * ``meta``: a JSON string with the format version, the config, the
+      non-empty neuron attributes (by neuron index) and state values that do
+      not belong to a neuron
+
+    Members are stored, not compressed, so ``read_npz`` can memory-map them.
+    Use ``write_replacing`` to overwrite a file a network was loaded from.
+    """
+    meta = dict(meta, version=FORMAT_VERSION)
+    with open(filepath, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+
+def write_json(filepath, arrays, meta, compression=None):
+    """Write the arrays and metadata of ``write_npz`` in the JSON layout of ``Network.save``.
+
+    The JSON is encoded and written a piece at a time, so a background thread
+    writing it never holds the GIL for long. ``compression`` is as for
+    ``open_text``.
+    """
+    names = arrays['names'].tolist()
+    types = arrays['types'].tolist()
+    attributes = meta.get('attributes', {})
+    sources, targets = arrays['sources'].tolist(), arrays['targets'].tolist()
+    data = {
+        'neurons': {name: {'type': types[t], 'position': position, 'attributes': attributes.get(str(i), {})}
+                    for i, (name, t, position) in enumerate(zip(names, arrays['neuron_types'].tolist(), arrays['positions'].tolist()))},
+        'connections': {f"{names[s]}->{names[t]}": weight for s, t, weight in zip(sources, targets, arrays['weights'].tolist())},
+        'state': {**dict(zip(names, arrays['state'].tolist())), **meta.get('extra_state', {})},
+        'config': meta['config'],
+    }
+    compression = compression or compression_of(filepath)
+    with open_text(filepath, 'w', compression) as f:
+        encoder = json.JSONEncoder(separators=(',', ':')) if compression else json.JSONEncoder(indent=4)
+        for chunk in encoder.iterencode(data):
+            f.write(chunk)
+
+def _member_offset(f, info):
+    # Position of the member's data: its local header repeats the name and may have its own extra field
+    f.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+    return info.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+
+def _mapped_array(f, filepath, info):
+    f.seek(_member_offset(f, info))
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    if dtype.hasobject:
+        raise ValueError(f"Object arrays are not allowed in network files ({info.filename})")
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    # Copy-on-write: the arrays can be modified without touching the file
+    mapped = np.memmap(filepath, dtype=dtype, mode='c', offset=f.tell(), shape=shape, order='F' if fortran_order else 'C')
+    return mapped.view(np.ndarray)
+
+def read_npz(filepath, mmap=True):
+    """Read a file written by ``write_npz``; returns ``(arrays, meta)``.
+
+    With ``mmap`` the arrays are memory-mapped (copy-on-write) instead of
+    read, so pages of large connection arrays are only loaded when used.
+    """
+    arrays = {}
+    with zipfile.ZipFile(filepath) as archive, open(filepath, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')] if info.filename.endswith('.npy') else info.filename
+            if mmap and info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = _mapped_array(f, filepath, info)
+            else:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+    meta = json.loads(str(arrays.pop('meta')))
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported network file version: {meta.get('version')}")
+    return arrays, meta
@@ -0,0 +1,31 @@
+# NeuralNetwork/initializers.py
+import math
+import numpy as np
+
+def _uniform(shape, rng, low=-0.5, high=0.5):
+    return rng.uniform(low, high, shape)
+
+def _xavier(shape, rng):
+    # Glorot uniform: keeps the activation variance roughly constant for sigmoid/tanh layers
+    limit = math.sqrt(6.0 / max(shape[0] + shape[1], 1))
+    return rng.uniform(-limit, limit, shape)
+
+def _he(shape, rng):
+    # He normal, for ReLU layers
+    return rng.normal(0.0, math.sqrt(2.0 / max(shape[0], 1)), shape)
+
+INITIALIZERS = {
+    'uniform': _uniform,
+    'xavier': _xavier,
+    'he': _he,
+}
+
+def initial_weights(shape, method='uniform', rng=None, **options):
+    """A (fan_in x fan_out) weight matrix drawn by 'uniform', 'xavier' or 'he'.
+
+    ``rng`` is a numpy Generator or a seed. 'uniform' takes ``low`` and
+    ``high`` (default -0.5 and 0.5).
+    """
+    if method not in INITIALIZERS:
+        raise ValueError(f"Unknown weight initialization: {method}")
+    return INITIALIZERS[method](tuple(shape), np.random.default_rng(rng), **options)
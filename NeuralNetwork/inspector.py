@@ -54,10 +54,8 @@ class NeuronInspectorDialog(QtWidgets.QDialog):
     
     def populate_connections_tab(self):
         self.connections_table.setRowCount(0)
-        outgoing = []
-        for (s, t), conn in self.network.connections.items():
-            if s == self.neuron_name:
-                outgoing.append((t, conn.get_weight()))
+        outgoing = [(t, self.network.connections[(self.neuron_name, t)].get_weight())
+                    for t in self.network.get_outgoing(self.neuron_name)]
 
         self.connections_table.setRowCount(len(outgoing))
         for row, (target, weight) in enumerate(outgoing):
@@ -0,0 +1,225 @@
+# NeuralNetwork/journal.py
+import os
+import json
+import numpy as np
+
+JOURNAL_SUFFIX = '.journal'
+
+def journal_path(snapshot_path):
+    """The journal file that belongs to a snapshot file."""
+    return os.fspath(snapshot_path) + JOURNAL_SUFFIX
+
+def _stamp(snapshot_id):
+    # First line of a journal: the id Network.save wrote into the snapshot the journal belongs to
+    return ['snapshot', snapshot_id]
+
+def _read_header(path):
+    with open(path) as f:
+        try:
+            return json.loads(f.readline())
+        except ValueError:
+            return None
+
+def _neuron_entry(neuron):
+    return json.dumps([neuron.position, neuron.type, neuron.attributes])
+
+def _config_entry(network):
+    return json.dumps(network.config.to_dict())
+
+def _versions(network):
+    return (network.weights_version, network.topology_version, network.decay_epoch)
+
+def _baseline(network):
+    return ({name: _neuron_entry(n) for name, n in network.neurons.items()}, dict(network.state), _config_entry(network))
+
+def journal_handover(network, snapshot_path, snapshot_id):
+    """What a Journal attached to ``network`` later needs to append to the journal of ``snapshot_path``.
+
+    Set as ``network.journal_handover`` by ``Network.load`` right after it
+    loaded the snapshot and replayed its journal.
+    """
+    return {'path': os.path.abspath(snapshot_path), 'snapshot_id': snapshot_id,
+            'versions': _versions(network), 'baseline': _baseline(network)}
+
+class Journal:
+    """Append-only log of a Network's changes since its last snapshot.
+
+    Attaching a journal to a network (``Journal(network, path)``) makes the
+    network report neuron, connection and weight changes and decay steps to
+    it; ``flush`` appends them to ``<path>.journal`` as one JSON array per
+    line, followed by the neuron positions/types/attributes, state values and
+    config that differ from the last flush. ``Network.load`` replays the
+    journal on top of the snapshot. A flush therefore costs time proportional
+    to the changes, not to the size of the network.
+
+    The journal starts with the id that ``Network.save`` wrote into the
+    snapshot, so it is only replayed onto that snapshot, wherever the pair
+    is copied. A new Journal writes a full snapshot on its first flush,
+    unless the network was loaded from ``path`` by ``Network.load`` and its
+    connections have not changed since (``network.journal_handover``); it
+    then keeps appending to the journal it replayed.
+
+    ``compact`` (a full ``Network.save`` to ``path``) folds the journal back
+    into the snapshot. ``flush`` compacts instead of appending when the
+    journal has outgrown
+    ``compact_ratio`` times the snapshot, when more than ``max_pending``
+    changes are waiting, or after ``neurons``/``connections`` were replaced
+    or edited directly (see ``Network.invalidate_topology``).
+    """
+    def __init__(self, network, path, compact_ratio=0.5, max_pending=1000000):
+        self.network = network
+        self.snapshot_path = os.path.abspath(path)
+        self.path = journal_path(self.snapshot_path)
+        self.compact_ratio = compact_ratio
+        self.max_pending = max_pending
+        self._records = []
+        self._pending = 0
+        self.snapshot_id = None
+        self._needs_snapshot = True
+        handover = network.journal_handover
+        if (handover is not None and handover['path'] == self.snapshot_path and handover['snapshot_id'] is not None
+                and handover['versions'] == _versions(network)):
+            # Loaded from this snapshot: the journal replayed then (if any) describes the network up to the baseline
+            network.journal_handover = None
+            self.snapshot_id = handover['snapshot_id']
+            self._neurons, self._state, self._config = handover['baseline']
+            self._needs_snapshot = False
+            if not os.path.exists(self.path) or _read_header(self.path) != _stamp(self.snapshot_id):
+                self._start_file()
+        else:
+            self._capture_baseline()
+        network.journal = self
+
+    def record(self, op, *args, size=1):
+        """Called by the network for every change; ``size`` is the number of items in a bulk record."""
+        if self._needs_snapshot:
+            return
+        self._pending += size
+        if self._pending > self.max_pending:
+            self.require_snapshot()
+            return
+        self._records.append([op, *args])
+
+    def require_snapshot(self):
+        """Make the next flush write a full snapshot (the change log no longer describes the network)."""
+        self._needs_snapshot = True
+        self._records, self._pending = [], 0
+
+    def _capture_baseline(self):
+        self._neurons, self._state, self._config = _baseline(self.network)
+
+    def _differences(self):
+        # Final values of everything the network does not report as it changes
+        records = []
+        for name, neuron in self.network.neurons.items():
+            entry = _neuron_entry(neuron)
+            if self._neurons.get(name) != entry:
+                records.append(['neuron', name, neuron.position, neuron.type, neuron.attributes])
+        state = dict(self.network.state)
+        changed = {name: value for name, value in state.items() if self._state.get(name) != value}
+        if changed:
+            records.append(['state', changed])
+        config = _config_entry(self.network)
+        if config != self._config:
+            records.append(['config', json.loads(config)])
+        return records
+
+    def flush(self):
+        """Append the changes since the last flush (or compact); returns True on success."""
+        if self._needs_snapshot:
+            return self.compact()
+        try:
+            lines = [json.dumps(record) + '\n' for record in self._records + self._differences()]
+            with open(self.path, 'a') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            print(f"Error writing network journal: {e}")
+            return False
+        self._records, self._pending = [], 0
+        self._capture_baseline()
+        if os.path.getsize(self.path) > self.compact_ratio * os.path.getsize(self.snapshot_path):
+            return self.compact()
+        return True
+
+    def compact(self):
+        """Write a full snapshot and start an empty journal; returns True on success."""
+        return self.network.save(self.snapshot_path)
+
+    def _start_file(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps(_stamp(self.snapshot_id)) + '\n')
+
+    def reset(self, snapshot_id):
+        """Start an empty journal for the snapshot just written with ``snapshot_id`` (called by Network.save)."""
+        self.snapshot_id = snapshot_id
+        self._start_file()
+        self._records, self._pending = [], 0
+        self._needs_snapshot = False
+        self._capture_baseline()
+
+    def detach(self):
+        """Stop recording; the journal file is kept."""
+        if self.network.journal is self:
+            self.network.journal = None
+
+def replay_journal(network, snapshot_path, snapshot_id):
+    """Apply the journal of ``snapshot_path`` to a network just loaded from it.
+
+    ``snapshot_id`` is the id stored in the snapshot. Returns the number of
+    records applied. A journal written for a different snapshot (or for one
+    without an id) is ignored. A record cut short at the end of the file (a
+    flush interrupted by a crash) is dropped.
+    """
+    path = journal_path(snapshot_path)
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        lines = f.readlines()
+    records = []
+    for number, line in enumerate(lines):
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            if number == len(lines) - 1:
+                break
+            raise ValueError(f"Corrupt network journal {path}, line {number + 1}")
+    if not records or snapshot_id is None or records[0] != _stamp(snapshot_id):
+        print(f"Ignoring network journal {path}: it was written for a different snapshot")
+        return 0
+
+    for op, *args in records[1:]:
+        if op == 'add':
+            name, value, position, n_type, attributes = args
+            network.add_neuron(name, value, tuple(position), n_type, attributes)
+        elif op == 'add_many':
+            names, values, positions, types, attributes = args
+            network.add_neurons(names, values, positions, types, attributes)
+        elif op == 'remove':
+            network.remove_neuron(*args)
+        elif op == 'rename':
+            network.rename_neuron(*args)
+        elif op == 'connect':
+            network.connect(*args)
+        elif op == 'connect_many':
+            network.connect_many(*args)
+        elif op == 'disconnect':
+            network.remove_connection(*args)
+        elif op == 'weights':
+            keys, weights = args
+            network._set_weights([tuple(key) for key in keys], np.array(weights, dtype=np.float64))
+            network._all_weights_changed()
+        elif op == 'decay':
+            network._advance_decay_epoch(*args)
+        elif op == 'neuron':
+            name, position, n_type, attributes = args
+            neuron = network.neurons[name]
+            neuron.position, neuron.type, neuron.attributes = tuple(position), n_type, attributes
+        elif op == 'state':
+            network.state.update(args[0])
+        elif op == 'config':
+            network.config.update(args[0])
+        else:
+            raise ValueError(f"Unknown network journal record: {op}")
+    return len(records) - 1
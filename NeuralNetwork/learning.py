@@ -1,100 +1,598 @@
 # NeuralNetwork/learning.py
-import math
-import random
+import os
+import copy
+import queue
+import threading
+from itertools import islice
+import numpy as np
+from .optimizers import make_optimizer, make_schedule
+from .activations import get_activation
+
+# Learning rate of a BackpropNetwork given none, when its optimizer has no default either
+DEFAULT_LEARNING_RATE = 0.5
+
+def sample_record_dtype(num_inputs, num_outputs, dtype=np.float64):
+    """Record layout of the ``.npy`` sample files written by Dataset.save and read by SampleStream."""
+    return np.dtype([('inputs', dtype, (num_inputs,)), ('targets', dtype, (num_outputs,))])
+
+class Dataset:
+    """Training samples kept as contiguous (count x inputs) and (count x outputs) arrays.
+
+    ``append`` grows the arrays in place, doubling their capacity when full.
+    Iterating yields ``(inputs, targets)`` rows, so a Dataset can stand in for
+    the usual list of sample tuples. ``shuffled`` and ``split`` return
+    DatasetViews, which reorder or subset the rows without copying them.
+    """
+    def __init__(self, num_inputs, num_outputs, capacity=16, dtype=np.float64):
+        self._inputs = np.zeros((capacity, num_inputs), dtype=dtype)
+        self._targets = np.zeros((capacity, num_outputs), dtype=dtype)
+        self._count = 0
+
+    @classmethod
+    def from_samples(cls, samples, dtype=np.float64):
+        """Build a Dataset from a sequence of ``(inputs, targets)`` pairs."""
+        inputs = np.array([sample[0] for sample in samples], dtype=dtype)
+        targets = np.array([sample[1] for sample in samples], dtype=dtype)
+        if inputs.ndim != 2 or targets.ndim != 2:
+            raise ValueError("Samples must be non-empty (inputs, targets) pairs of equal-length sequences")
+        dataset = cls(inputs.shape[1], targets.shape[1], capacity=len(inputs), dtype=dtype)
+        dataset.extend(inputs, targets)
+        return dataset
+
+    @property
+    def inputs(self):
+        return self._inputs[:self._count]
+
+    @property
+    def targets(self):
+        return self._targets[:self._count]
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, row):
+        return self.take(row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.take(row)
+
+    def _reserve(self, needed):
+        if needed <= len(self._inputs):
+            return
+        capacity = max(needed, 2 * len(self._inputs), 16)
+        for name in ('_inputs', '_targets'):
+            old = getattr(self, name)
+            grown = np.zeros((capacity, old.shape[1]), dtype=old.dtype)
+            grown[:self._count] = old[:self._count]
+            setattr(self, name, grown)
+
+    def append(self, inputs, targets):
+        self._reserve(self._count + 1)
+        self._inputs[self._count] = inputs
+        self._targets[self._count] = targets
+        self._count += 1
+
+    def extend(self, inputs, targets):
+        """Append many samples given as (count x inputs) and (count x outputs) arrays."""
+        inputs, targets = np.asarray(inputs), np.asarray(targets)
+        if len(inputs) != len(targets):
+            raise ValueError("inputs and targets must have the same number of rows")
+        self._reserve(self._count + len(inputs))
+        self._inputs[self._count:self._count + len(inputs)] = inputs
+        self._targets[self._count:self._count + len(inputs)] = targets
+        self._count += len(inputs)
+
+    def clear(self):
+        self._count = 0
+
+    def save(self, filepath):
+        """Write the samples to a ``.npy`` file that SampleStream can memory-map."""
+        inputs, targets = self.inputs, self.targets
+        records = np.empty(len(inputs), sample_record_dtype(inputs.shape[1], targets.shape[1], inputs.dtype))
+        records['inputs'] = inputs
+        records['targets'] = targets
+        np.save(filepath, records)
+
+    @classmethod
+    def load(cls, filepath):
+        records = np.load(filepath)
+        dataset = cls(records['inputs'].shape[1], records['targets'].shape[1], capacity=len(records), dtype=records['inputs'].dtype)
+        dataset.extend(records['inputs'], records['targets'])
+        return dataset
+
+    def take(self, rows):
+        """Inputs and targets of ``rows`` (an index, slice or index array); slices are views."""
+        return self.inputs[rows], self.targets[rows]
+
+    def batches(self, batch_size):
+        """Yield ``(inputs, targets)`` arrays of up to ``batch_size`` consecutive rows."""
+        for start in range(0, len(self), batch_size):
+            yield self.take(slice(start, start + batch_size))
+
+    def _dataset_rows(self):
+        return self, np.arange(len(self))
+
+    def shuffled(self, rng=None):
+        """A view of the samples in random order."""
+        dataset, rows = self._dataset_rows()
+        return DatasetView(dataset, (rng or np.random).permutation(rows))
+
+    def split(self, validation_fraction=0.2, shuffle=True, rng=None):
+        """Split into ``(training, validation)`` views; the validation view gets the last rows."""
+        dataset, rows = self._dataset_rows()
+        if shuffle:
+            rows = (rng or np.random).permutation(rows)
+        cut = len(rows) - int(round(len(rows) * validation_fraction))
+        return DatasetView(dataset, rows[:cut]), DatasetView(dataset, rows[cut:])
+
+class DatasetView(Dataset):
+    """Selected rows of a Dataset, in a given order. Rows are gathered when read."""
+    def __init__(self, dataset, rows):
+        self.dataset = dataset
+        self.rows = np.asarray(rows, dtype=np.intp)
+
+    @property
+    def inputs(self):
+        return self.dataset.inputs[self.rows]
+
+    @property
+    def targets(self):
+        return self.dataset.targets[self.rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def take(self, rows):
+        return self.dataset.take(self.rows[rows])
+
+    def _dataset_rows(self):
+        return self.dataset, self.rows
+
+    def append(self, inputs, targets):
+        raise TypeError("Cannot append to a DatasetView")
+
+    def extend(self, inputs, targets):
+        raise TypeError("Cannot append to a DatasetView")
+
+    def clear(self):
+        raise TypeError("Cannot clear a DatasetView")
+
+class SampleStream:
+    """Training samples read chunk by chunk instead of being held in memory.
+
+    ``source`` is either the path of a sample file written by Dataset.save
+    (memory-mapped), a function returning a fresh iterator of ``(inputs,
+    targets)`` pairs for every epoch, or a re-iterable collection of pairs. A
+    generator object can only be read once, so it is good for one epoch
+    only. Each epoch yields chunks of ``chunk_size`` rows; the next
+    ``prefetch`` chunks are read on a background thread while the current one
+    trains. When shuffling, samples pass through a buffer of
+    ``shuffle_buffer`` rows, which bounds memory at the cost of only locally
+    shuffling the order.
+    """
+    def __init__(self, source, chunk_size=1024, shuffle_buffer=4096, prefetch=2):
+        if isinstance(source, (str, os.PathLike)):
+            source = np.load(source, mmap_mode='r')
+        self.source = source
+        self.chunk_size = chunk_size
+        self.shuffle_buffer = shuffle_buffer
+        self.prefetch = prefetch
+        self._consumed = False
+
+    def _chunks(self):
+        source = self.source
+        if isinstance(source, np.ndarray):
+            for start in range(0, len(source), self.chunk_size):
+                records = source[start:start + self.chunk_size]
+                yield np.array(records['inputs'], dtype=np.float64), np.array(records['targets'], dtype=np.float64)
+            return
+        if callable(source):
+            samples = source()
+        else:
+            samples = iter(source)
+            if samples is source:
+                if self._consumed:
+                    raise ValueError("Sample iterator already consumed; pass a function returning a new iterator to train for more than one epoch")
+                self._consumed = True
+        while True:
+            block = list(islice(samples, self.chunk_size))
+            if not block:
+                return
+            yield (np.array([sample[0] for sample in block], dtype=np.float64),
+                   np.array([sample[1] for sample in block], dtype=np.float64))
+
+    def _shuffled(self, chunks, rng):
+        # Bounded shuffle: mix each chunk into a buffer of shuffle_buffer rows and emit the overflow
+        buffered = None
+        for inputs, targets in chunks:
+            if buffered is not None:
+                inputs = np.concatenate((buffered[0], inputs))
+                targets = np.concatenate((buffered[1], targets))
+            order = rng.permutation(len(inputs))
+            emit, keep = order[:max(len(inputs) - self.shuffle_buffer, 0)], order[len(order) - min(len(inputs), self.shuffle_buffer):]
+            if len(emit):
+                yield inputs[emit], targets[emit]
+            buffered = inputs[keep], targets[keep]
+        if buffered is not None and len(buffered[0]):
+            yield buffered
+
+    def epoch(self, shuffle=False, rng=None):
+        """Yield ``(inputs, targets)`` arrays that together cover every sample once."""
+        chunks = self._chunks()
+        if shuffle and self.shuffle_buffer:
+            chunks = self._shuffled(chunks, rng or np.random)
+        if self.prefetch:
+            chunks = _prefetched(chunks, self.prefetch)
+        yield from chunks
+
+def _forward(weights, functions, inputs):
+    # Activations of every layer, input layer first
+    activations = [np.asarray(inputs, dtype=np.float64)]
+    for matrix, function in zip(weights, functions):
+        incoming = activations[-1] @ matrix
+        activations.append(function(incoming, out=incoming))
+    return activations
+
+def _gradients(weights, functions, inputs, expected_outputs):
+    """Backpropagate a batch (one sample per row) through ``weights``.
+
+    ``functions`` are the Activations of the layers after the input layer.
+    Returns the activations, the gradient of every weight matrix summed over
+    the batch and the summed squared error.
+    """
+    activations = _forward(weights, functions, inputs)
+    output = activations[-1]
+
+    # Output deltas, then backpropagate through the (not yet updated) weights
+    error = expected_outputs - output
+    deltas = [error * functions[-1].derivative(output)]
+    for i in range(len(weights) - 1, 0, -1):
+        deltas.append((deltas[-1] @ weights[i].T) * functions[i - 1].derivative(activations[i]))
+    deltas.reverse()
+    gradients = [values.T @ delta for values, delta in zip(activations, deltas)]
+    return activations, gradients, float(np.vdot(error, error))
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+def _prefetched(iterator, depth):
+    """Run ``iterator`` on a background thread, keeping up to ``depth`` items ready."""
+    ready = queue.Queue(depth)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(finished)
+        except BaseException as error:
+            put(_Failure(error))
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = ready.get()
+            if item is finished:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+class FrozenModel:
+    """Read-only snapshot of a trained BackpropNetwork for inference.
+
+    Holds its own copies of the weight matrices and never touches the
+    Network, so it can be used from a worker thread while the GUI works with
+    the original. ``predict`` reuses preallocated activation buffers (one set
+    per calling thread) and allocates nothing.
+    """
+    __slots__ = ('weights', 'activations', 'input_names', 'output_names', '_local')
+
+    def __init__(self, weights, activations, input_names, output_names):
+        frozen = []
+        for matrix in weights:
+            matrix = np.array(matrix, dtype=np.float64)
+            matrix.setflags(write=False)
+            frozen.append(matrix)
+        self.weights = tuple(frozen)
+        self.activations = tuple(activations)
+        self.input_names = tuple(input_names)
+        self.output_names = tuple(output_names)
+        self._local = threading.local()
+
+    def _buffers(self):
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            sizes = [len(self.input_names)] + [matrix.shape[1] for matrix in self.weights]
+            buffers = self._local.buffers = [np.empty(size) for size in sizes]
+        return buffers
+
+    def predict(self, inputs, out=None):
+        """Output layer values for one input vector.
+
+        The result is a buffer that the next call from the same thread
+        overwrites; pass ``out`` (or copy it) to keep it.
+        """
+        buffers = self._buffers()
+        values = buffers[0]
+        values[...] = inputs
+        for matrix, activation, result in zip(self.weights, self.activations, buffers[1:]):
+            np.matmul(values, matrix, out=result)
+            activation(result, out=result)
+            values = result
+        if out is not None:
+            out[...] = values
+            return out
+        return values
 
 class BackpropNetwork:
-    def __init__(self, network, learning_rate=0.5, momentum_factor=0.2):
+    """Backpropagation over a layered Network.
+
+    ``set_layers`` compiles the layer list into one weight matrix per pair of
+    adjacent layers (rows: previous layer, columns: next layer). A connection
+    counts in either direction; pairs without one stay at zero and are never
+    trained. Forward and backward passes are matrix operations on these
+    weights, which are written back to ``network.connections`` by
+    ``sync_weights`` (``train`` does this when it finishes). The matrices are
+    recompiled automatically when the network's topology or weights change.
+
+    ``train(..., batch_size=n)`` averages the gradient over mini-batches of
+    ``n`` samples and applies it once per batch; the default of 1 updates after
+    every sample. The update rule is an Optimizer (see optimizers.py), SGD
+    with ``momentum_factor`` unless given. Without a ``learning_rate`` the
+    optimizer's own default is used (0.01 for RMSProp and Adam), or 0.5.
+    Every layer after the input layer uses sigmoid unless ``set_layers`` is
+    given other activations.
+    """
+    def __init__(self, network, learning_rate=None, momentum_factor=0.2, optimizer='sgd'):
         self.network = network
         self.learning_rate = learning_rate
         self.momentum = momentum_factor
+        self.optimizer = make_optimizer(optimizer, momentum_factor)
         self.layers = []
-        self.previous_weight_updates = {}
+        self.activations = []
+        self.weights = []
+        self._masks = []
+        self._edges = []
+        self._compiled_for = None
+        self._last_inputs = None
 
-    def set_layers(self, layer_list):
+    def set_layers(self, layer_list, activations='sigmoid'):
+        """Set the layers (lists of neuron names, input layer first).
+
+        ``activations`` is one activation (a name from activations.py or an
+        Activation) for all layers after the input layer, or a list with one
+        per such layer.
+        """
+        if isinstance(activations, (list, tuple)):
+            if len(activations) != len(layer_list) - 1:
+                raise ValueError("Need one activation per layer after the input layer")
+        else:
+            activations = [activations] * (len(layer_list) - 1)
         self.layers = layer_list
+        self.activations = [get_activation(activation) for activation in activations]
+        self.compile()
+        self.reset_optimizer()
+
+    def reset_optimizer(self):
+        """Forget the optimizer's accumulated state (momentum and the like)."""
+        self.optimizer.reset(self.weights)
+
+    def compile(self):
+        """Read the connection weights between adjacent layers into matrices."""
+        connections = self.network.connections
+        self.weights, self._masks, self._edges = [], [], []
+        for prev_layer_names, curr_layer_names in zip(self.layers, self.layers[1:]):
+            rows, cols, keys = [], [], []
+            for row, prev_neuron in enumerate(prev_layer_names):
+                for col, curr_neuron in enumerate(curr_layer_names):
+                    # Check for connection in both directions
+                    for key in ((prev_neuron, curr_neuron), (curr_neuron, prev_neuron)):
+                        if key in connections:
+                            rows.append(row)
+                            cols.append(col)
+                            keys.append(key)
+                            break
+            rows, cols = np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+            matrix = np.zeros((len(prev_layer_names), len(curr_layer_names)))
+            matrix[rows, cols] = self.network._get_weights(keys)
+            mask = np.zeros(matrix.shape, dtype=bool)
+            mask[rows, cols] = True
+            self.weights.append(matrix)
+            self._masks.append(mask)
+            self._edges.append((rows, cols, keys))
+        if getattr(self.optimizer, 'shapes', None) != [matrix.shape for matrix in self.weights]:
+            self.reset_optimizer()
+        self._compiled_for = (self.network.compiled_topology(), self.network.weights_version)
+
+    def _ensure_compiled(self):
+        if self._compiled_for != (self.network.compiled_topology(), self.network.weights_version):
+            self.compile()
+
+    def sync_weights(self):
+        """Write the weight matrices back into ``network.connections``."""
+        for matrix, (rows, cols, keys) in zip(self.weights, self._edges):
+            self.network._set_weights(keys, matrix[rows, cols])
+        self.network._all_weights_changed()
+        self._compiled_for = (self.network.compiled_topology(), self.network.weights_version)
+
+    def freeze(self):
+        """A FrozenModel with the current weights, for fast inference off the Network."""
+        self._ensure_compiled()
+        return FrozenModel(self.weights, self.activations, self.layers[0], self.layers[-1])
 
-    def _sigmoid(self, x):
-        return 1 / (1 + math.exp(-x))
+    def _forward(self, inputs):
+        return _forward(self.weights, self.activations, inputs)
 
-    def _sigmoid_derivative(self, y):
-        return y * (1.0 - y)
+    def _write_state(self, activations):
+        state = self.network.state
+        for names, values in zip(self.layers, activations):
+            state.update(zip(names, values.tolist()))
 
     def forward_pass(self, inputs):
-        # Set input neuron values
-        input_layer = self.layers[0]
-        for i, input_name in enumerate(input_layer):
-            self.network.state[input_name] = inputs[i]
-        
-        # Propagate through the layers
-        for i in range(1, len(self.layers)):
-            prev_layer_names = self.layers[i-1]
-            curr_layer_names = self.layers[i]
-            
-            for curr_neuron in curr_layer_names:
-                net_input = 0
-                for prev_neuron in prev_layer_names:
-                    # Check for connection in both directions
-                    conn = self.network.connections.get((prev_neuron, curr_neuron)) or \
-                           self.network.connections.get((curr_neuron, prev_neuron))
-                    if conn:
-                        net_input += self.network.state[prev_neuron] * conn.get_weight()
-                
-                self.network.state[curr_neuron] = self._sigmoid(net_input)
-                
+        self._ensure_compiled()
+        activations = self._forward(inputs)
+        self._write_state(activations)
         # Return output layer values
-        return [self.network.state[name] for name in self.layers[-1]]
+        return activations[-1].tolist()
+
+    def predict(self, inputs):
+        """Output layer values for every row of an (M x inputs) array, as an (M x outputs) array."""
+        self._ensure_compiled()
+        return self._forward(np.atleast_2d(np.asarray(inputs, dtype=np.float64)))[-1]
+
+    def evaluate(self, inputs, targets):
+        """``{'mse', 'accuracy'}`` of the predictions for a set of samples.
+
+        ``mse`` is the squared error per sample averaged over the samples, the
+        same measure ``train`` reports per epoch. A prediction is accurate when
+        its largest output is the target's largest, or for a single output
+        when both are on the same side of 0.5.
+        """
+        outputs = self.predict(inputs)
+        targets = np.asarray(targets, dtype=np.float64).reshape(outputs.shape)
+        error = targets - outputs
+        if outputs.shape[1] == 1:
+            correct = (outputs[:, 0] > 0.5) == (targets[:, 0] > 0.5)
+        else:
+            correct = outputs.argmax(axis=1) == targets.argmax(axis=1)
+        return {'mse': float(np.vdot(error, error)) / len(outputs), 'accuracy': float(np.mean(correct))}
+
+    def _apply_gradients(self, gradients, count, learning_rate):
+        # Batch-averaged gradients, zero for unconnected pairs; weights are kept in [-1, 1] like Connection.set_weight
+        for gradient, mask in zip(gradients, self._masks):
+            gradient *= mask / count
+        for matrix, update in zip(self.weights, self.optimizer.updates(gradients, learning_rate)):
+            matrix += update
+            np.clip(matrix, -1.0, 1.0, out=matrix)
+
+    def _epoch_batches(self, training_data, batch_size, shuffle, rng):
+        if isinstance(training_data, SampleStream):
+            # Batches do not span chunks
+            for inputs, targets in training_data.epoch(shuffle, rng):
+                for start in range(0, len(inputs), batch_size):
+                    yield inputs[start:start + batch_size], targets[start:start + batch_size]
+        else:
+            yield from (training_data.shuffled(rng) if shuffle else training_data).batches(batch_size)
+
+    def train(self, training_data, epochs=1000, target_error_threshold=0.01, progress_callback=None, **options):
+        """Train on ``(inputs, expected_outputs)`` pairs; returns the average error of every epoch.
+
+        Runs ``fit`` (see there for the options) and then writes the trained
+        weights to the network, leaving it showing the last sample.
+        """
+        self._ensure_compiled()
+        self._last_inputs = None
+        try:
+            return self.fit(training_data, epochs, target_error_threshold, progress_callback, **options)
+        finally:
+            self.sync_weights()
+            if self._last_inputs is not None:
+                # Leave the network showing the last sample, as a forward_pass would
+                self._write_state(self._forward(self._last_inputs))
+
+    def detached_copy(self):
+        """A copy with its own weight matrices and optimizer state.
+
+        ``fit`` on the copy never touches the Network, so it can run on a
+        worker thread while this learner keeps serving ``forward_pass``; bring
+        the result back with ``adopt``.
+        """
+        self._ensure_compiled()
+        detached = copy.copy(self)
+        detached.weights = [matrix.copy() for matrix in self.weights]
+        detached.optimizer = copy.deepcopy(self.optimizer)
+        return detached
 
-    def train(self, training_data, epochs=1000, target_error_threshold=0.01, progress_callback=None):
+    def adopt(self, trained):
+        """Swap in the weights and optimizer state of a ``detached_copy`` and write them to the network."""
+        self._ensure_compiled()
+        if [keys for _, _, keys in self._edges] != [keys for _, _, keys in trained._edges]:
+            raise ValueError("The network's connections changed while the copy was trained")
+        self.weights, self.optimizer = trained.weights, trained.optimizer
+        self.sync_weights()
+
+    def _base_learning_rate(self):
+        if self.learning_rate is not None:
+            return self.learning_rate
+        return self.optimizer.learning_rate or DEFAULT_LEARNING_RATE
+
+    def fit(self, training_data, epochs=1000, target_error_threshold=0.01, progress_callback=None,
+            batch_size=1, shuffle=None, workers=None, seed=None, optimizer=None, schedule=None):
+        """Train the compiled weight matrices without writing them to the network.
+
+        ``training_data`` is a Dataset (or DatasetView), used without copying,
+        a SampleStream, read chunk by chunk every epoch, or a sequence of
+        pairs. ``shuffle`` reorders the samples at the start of every epoch
+        (through the stream's shuffle buffer for a SampleStream); by default
+        this is done only when ``batch_size`` is above 1. ``seed`` makes the
+        shuffling reproducible.
+
+        With ``workers`` above 1 every mini-batch is split across that many
+        processes (see parallel.ParallelTrainer); use a large ``batch_size``
+        for this to pay off.
+
+        ``optimizer`` replaces the learner's optimizer ('sgd', 'nesterov',
+        'rmsprop', 'adam' or an Optimizer) and ``schedule`` varies the
+        learning rate per epoch ('step', 'cosine', 'plateau' or a Schedule).
+        """
+        if optimizer is not None:
+            self.optimizer = make_optimizer(optimizer, self.momentum)
+            self.reset_optimizer()
+        schedule = make_schedule(schedule, epochs)
+        if not isinstance(training_data, (Dataset, SampleStream)):
+            training_data = Dataset.from_samples(training_data)
+        if shuffle is None:
+            shuffle = batch_size > 1
+        rng = np.random.default_rng(seed) if seed is not None else None
+        trainer = None
+        if workers is not None and workers > 1:
+            from .parallel import ParallelTrainer
+            trainer = ParallelTrainer(self, workers, batch_size)
         epoch_errors = []
-        for epoch in range(epochs):
-            total_error = 0
-            for inputs, expected_outputs in training_data:
-                # Forward pass
-                actual_outputs = self.forward_pass(inputs)
-                
-                # Calculate error and deltas for the output layer
-                output_deltas = {}
-                for i, output_name in enumerate(self.layers[-1]):
-                    error = expected_outputs[i] - actual_outputs[i]
-                    total_error += error**2
-                    output_deltas[output_name] = error * self._sigmoid_derivative(actual_outputs[i])
-                
-                # Backpropagate error
-                deltas = {**output_deltas}
-                for i in range(len(self.layers) - 2, 0, -1):
-                    hidden_deltas = {}
-                    for hidden_name in self.layers[i]:
-                        error = 0
-                        for next_layer_name in self.layers[i+1]:
-                            conn = self.network.connections.get((hidden_name, next_layer_name)) or \
-                                   self.network.connections.get((next_layer_name, hidden_name))
-                            if conn:
-                                error += deltas[next_layer_name] * conn.get_weight()
-                        hidden_deltas[hidden_name] = error * self._sigmoid_derivative(self.network.state[hidden_name])
-                    deltas.update(hidden_deltas)
-                
-                # Update weights
-                for i in range(1, len(self.layers)):
-                    for prev_neuron in self.layers[i-1]:
-                        for curr_neuron in self.layers[i]:
-                            conn_key = (prev_neuron, curr_neuron)
-                            rev_key = (curr_neuron, prev_neuron)
-                            conn = self.network.connections.get(conn_key) or self.network.connections.get(rev_key)
-                            
-                            if conn:
-                                momentum_term = self.momentum * self.previous_weight_updates.get(conn_key, 0)
-                                weight_update = (self.learning_rate * deltas[curr_neuron] * self.network.state[prev_neuron]) + momentum_term
-                                conn.set_weight(conn.get_weight() + weight_update)
-                                self.previous_weight_updates[conn_key] = weight_update
-
-            avg_error = total_error / len(training_data)
-            epoch_errors.append(avg_error)
-            
-            if progress_callback and not progress_callback(epoch, avg_error):
-                break
-                
-            if avg_error <= target_error_threshold:
-                print(f"\nTarget error reached at epoch {epoch+1}")
-                break
-        
-        return epoch_errors
\ No newline at end of file
+        try:
+            for epoch in range(epochs):
+                learning_rate = schedule.learning_rate(epoch, self._base_learning_rate())
+                total_error, count = 0, 0
+                for inputs, expected_outputs in self._epoch_batches(training_data, batch_size, shuffle, rng):
+                    if trainer is None:
+                        _, gradients, error = _gradients(self.weights, self.activations, inputs, expected_outputs)
+                    else:
+                        gradients, error = trainer.gradients(inputs, expected_outputs)
+                    self._apply_gradients(gradients, len(inputs), learning_rate)
+                    total_error += error
+                    count += len(inputs)
+                    self._last_inputs = inputs[-1]
+
+                avg_error = total_error / count
+                epoch_errors.append(avg_error)
+                schedule.end_epoch(epoch, avg_error)
+
+                if progress_callback and not progress_callback(epoch, avg_error):
+                    break
+
+                if avg_error <= target_error_threshold:
+                    print(f"\nTarget error reached at epoch {epoch+1}")
+                    break
+        finally:
+            if trainer is not None:
+                trainer.close()
+
+        return epoch_errors
@@ -0,0 +1,166 @@
+# NeuralNetwork/optimizers.py
+import math
+import numpy as np
+
+class Optimizer:
+    """Turns batch gradients into weight updates for BackpropNetwork.
+
+    State is kept in arrays shaped like the learner's compiled weight
+    matrices; ``reset`` (re)creates it. ``updates`` receives the
+    batch-averaged gradients, already pointing in the direction that reduces
+    the error and zero for unconnected pairs, and returns the amount to add to
+    every matrix (which the caller must not modify). ``learning_rate``, if
+    set, is used by learners that were not given a rate of their own.
+    """
+    learning_rate = None
+
+    def reset(self, weights):
+        self.shapes = [matrix.shape for matrix in weights]
+
+    def updates(self, gradients, learning_rate):
+        raise NotImplementedError
+
+class SGD(Optimizer):
+    """Gradient descent with (optionally Nesterov) momentum; the default update rule."""
+    def __init__(self, momentum=0.2, nesterov=False, learning_rate=None):
+        self.momentum = momentum
+        self.nesterov = nesterov
+        self.learning_rate = learning_rate
+        self.shapes = None
+
+    def reset(self, weights):
+        super().reset(weights)
+        # Last update of every weight matrix, for the momentum term
+        self.velocity = [np.zeros_like(matrix) for matrix in weights]
+
+    def updates(self, gradients, learning_rate):
+        result = []
+        for velocity, gradient in zip(self.velocity, gradients):
+            step = learning_rate * gradient
+            velocity *= self.momentum
+            velocity += step
+            result.append(self.momentum * velocity + step if self.nesterov else velocity)
+        return result
+
+class RMSProp(Optimizer):
+    def __init__(self, learning_rate=0.01, decay=0.9, epsilon=1e-8):
+        self.learning_rate = learning_rate
+        self.decay = decay
+        self.epsilon = epsilon
+        self.shapes = None
+
+    def reset(self, weights):
+        super().reset(weights)
+        self.mean_square = [np.zeros_like(matrix) for matrix in weights]
+
+    def updates(self, gradients, learning_rate):
+        result = []
+        for mean_square, gradient in zip(self.mean_square, gradients):
+            mean_square *= self.decay
+            mean_square += (1 - self.decay) * gradient * gradient
+            result.append(learning_rate * gradient / (np.sqrt(mean_square) + self.epsilon))
+        return result
+
+class Adam(Optimizer):
+    def __init__(self, learning_rate=0.01, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        self.learning_rate = learning_rate
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.shapes = None
+
+    def reset(self, weights):
+        super().reset(weights)
+        self.steps = 0
+        self.first_moment = [np.zeros_like(matrix) for matrix in weights]
+        self.second_moment = [np.zeros_like(matrix) for matrix in weights]
+
+    def updates(self, gradients, learning_rate):
+        self.steps += 1
+        # Bias correction folded into the step size
+        step_size = learning_rate * math.sqrt(1 - self.beta2 ** self.steps) / (1 - self.beta1 ** self.steps)
+        result = []
+        for first, second, gradient in zip(self.first_moment, self.second_moment, gradients):
+            first *= self.beta1
+            first += (1 - self.beta1) * gradient
+            second *= self.beta2
+            second += (1 - self.beta2) * gradient * gradient
+            result.append(step_size * first / (np.sqrt(second) + self.epsilon))
+        return result
+
+class Schedule:
+    """Learning rate per epoch; ``end_epoch`` sees each epoch's average error."""
+    def learning_rate(self, epoch, base_rate):
+        return base_rate
+
+    def end_epoch(self, epoch, error):
+        pass
+
+class StepDecay(Schedule):
+    """Multiply the rate by ``gamma`` every ``step_size`` epochs."""
+    def __init__(self, step_size=100, gamma=0.5):
+        self.step_size = step_size
+        self.gamma = gamma
+
+    def learning_rate(self, epoch, base_rate):
+        return base_rate * self.gamma ** (epoch // self.step_size)
+
+class CosineDecay(Schedule):
+    """Anneal the rate from the base rate to ``min_rate`` along a half cosine over ``epochs``."""
+    def __init__(self, epochs, min_rate=0.0):
+        self.epochs = epochs
+        self.min_rate = min_rate
+
+    def learning_rate(self, epoch, base_rate):
+        progress = min(epoch, self.epochs) / max(self.epochs, 1)
+        return self.min_rate + (base_rate - self.min_rate) * 0.5 * (1 + math.cos(math.pi * progress))
+
+class ReduceOnPlateau(Schedule):
+    """Multiply the rate by ``factor`` when the error has not improved for ``patience`` epochs."""
+    def __init__(self, factor=0.5, patience=10, min_delta=1e-4, min_rate=1e-6):
+        self.factor = factor
+        self.patience = patience
+        self.min_delta = min_delta
+        self.min_rate = min_rate
+        self.scale = 1.0
+        self.best = math.inf
+        self.waited = 0
+
+    def learning_rate(self, epoch, base_rate):
+        return max(base_rate * self.scale, self.min_rate)
+
+    def end_epoch(self, epoch, error):
+        if error < self.best - self.min_delta:
+            self.best = error
+            self.waited = 0
+        else:
+            self.waited += 1
+            if self.waited > self.patience:
+                self.scale *= self.factor
+                self.waited = 0
+
+def make_optimizer(optimizer, momentum=0.2):
+    """An Optimizer from an instance or one of 'sgd', 'nesterov', 'rmsprop' and 'adam'."""
+    if isinstance(optimizer, Optimizer):
+        return optimizer
+    if optimizer == 'sgd':
+        return SGD(momentum)
+    if optimizer == 'nesterov':
+        return SGD(momentum, nesterov=True)
+    if optimizer == 'rmsprop':
+        return RMSProp()
+    if optimizer == 'adam':
+        return Adam()
+    raise ValueError(f"Unknown optimizer: {optimizer}")
+
+def make_schedule(schedule, epochs):
+    """A Schedule from an instance, None or one of 'step', 'cosine' and 'plateau'."""
+    if schedule is None or isinstance(schedule, Schedule):
+        return schedule or Schedule()
+    if schedule == 'step':
+        return StepDecay(step_size=max(epochs // 4, 1))
+    if schedule == 'cosine':
+        return CosineDecay(epochs)
+    if schedule == 'plateau':
+        return ReduceOnPlateau()
+    raise ValueError(f"Unknown learning rate schedule: {schedule}")
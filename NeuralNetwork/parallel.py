@@ -0,0 +1,111 @@
+# NeuralNetwork/parallel.py
+import os
+import multiprocessing
+import numpy as np
+from .learning import _gradients
+
+# BLAS thread pools are limited to one thread per worker; the workers are the parallelism
+_THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# Shared arrays of the current worker process, set up by _init_worker
+_shared = None
+
+def _as_array(buffer, shape):
+    return np.frombuffer(buffer, dtype=np.float64, count=int(np.prod(shape))).reshape(shape)
+
+def _init_worker(weight_buffers, gradient_buffers, input_buffer, target_buffer, error_buffer, activations, shapes, workers, batch_size, num_inputs, num_outputs):
+    global _shared
+    _shared = {
+        'activations': activations,
+        'weights': [_as_array(buffer, shape) for buffer, shape in zip(weight_buffers, shapes)],
+        'gradients': [_as_array(buffer, (workers,) + shape) for buffer, shape in zip(gradient_buffers, shapes)],
+        'inputs': _as_array(input_buffer, (batch_size, num_inputs)),
+        'targets': _as_array(target_buffer, (batch_size, num_outputs)),
+        'errors': _as_array(error_buffer, (workers,)),
+    }
+
+def _worker_step(task):
+    worker, start, stop = task
+    if stop <= start:
+        for gradient in _shared['gradients']:
+            gradient[worker] = 0
+        _shared['errors'][worker] = 0
+        return
+    _, gradients, error = _gradients(_shared['weights'], _shared['activations'], _shared['inputs'][start:stop], _shared['targets'][start:stop])
+    for shared, gradient in zip(_shared['gradients'], gradients):
+        shared[worker] = gradient
+    _shared['errors'][worker] = error
+
+class ParallelTrainer:
+    """Data-parallel mini-batch gradients for a BackpropNetwork.
+
+    The weight matrices, a batch buffer and one gradient slot per worker live
+    in shared memory. Each mini-batch is copied into the batch buffer and
+    split into one shard per worker process; every worker backpropagates its
+    shard against the shared weights and writes its gradient into its slot.
+    ``gradients`` sums the slots in worker order, so for a given worker count
+    the result is deterministic and matches serial training up to float
+    rounding. While the trainer is open, the learner's weight matrices are
+    the shared ones.
+    """
+    def __init__(self, learner, workers=None, batch_size=256):
+        self.learner = learner
+        self.workers = workers or os.cpu_count()
+        context = multiprocessing.get_context('spawn')
+        shapes = [matrix.shape for matrix in learner.weights]
+        num_inputs, num_outputs = len(learner.layers[0]), len(learner.layers[-1])
+
+        weight_buffers = [context.RawArray('d', max(matrix.size, 1)) for matrix in learner.weights]
+        gradient_buffers = [context.RawArray('d', max(self.workers * matrix.size, 1)) for matrix in learner.weights]
+        input_buffer = context.RawArray('d', max(batch_size * num_inputs, 1))
+        target_buffer = context.RawArray('d', max(batch_size * num_outputs, 1))
+        error_buffer = context.RawArray('d', self.workers)
+        self.weights = [_as_array(buffer, shape) for buffer, shape in zip(weight_buffers, shapes)]
+        self._gradients = [_as_array(buffer, (self.workers,) + shape) for buffer, shape in zip(gradient_buffers, shapes)]
+        self._inputs = _as_array(input_buffer, (batch_size, num_inputs))
+        self._targets = _as_array(target_buffer, (batch_size, num_outputs))
+        self._errors = _as_array(error_buffer, (self.workers,))
+        for shared, matrix in zip(self.weights, learner.weights):
+            shared[...] = matrix
+        learner.weights = self.weights
+
+        saved = {name: os.environ.get(name) for name in _THREAD_VARIABLES}
+        os.environ.update(dict.fromkeys(_THREAD_VARIABLES, '1'))
+        try:
+            self._pool = context.Pool(self.workers, _init_worker, (
+                weight_buffers, gradient_buffers, input_buffer, target_buffer, error_buffer,
+                learner.activations, shapes, self.workers, batch_size, num_inputs, num_outputs))
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    def gradients(self, inputs, expected_outputs):
+        """Summed gradients and squared error of a batch, computed across the workers."""
+        count = len(inputs)
+        self._inputs[:count] = inputs
+        self._targets[:count] = expected_outputs
+        bounds = np.linspace(0, count, self.workers + 1).astype(int)
+        self._pool.map(_worker_step, [(worker, bounds[worker], bounds[worker + 1]) for worker in range(self.workers)])
+        return [gradient.sum(axis=0) for gradient in self._gradients], float(self._errors.sum())
+
+    def close(self):
+        """Stop the workers and give the learner private copies of the trained weights."""
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.close()
+            pool.join()
+            self._pool = None
+        if self.learner.weights is self.weights:
+            self.learner.weights = [np.array(matrix) for matrix in self.weights]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
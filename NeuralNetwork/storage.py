@@ -0,0 +1,402 @@
+# NeuralNetwork/storage.py
+from collections.abc import MutableMapping, ItemsView, ValuesView
+import numpy as np
+
+def _grow(array, needed):
+    """Return ``array`` with capacity for at least ``needed`` items (doubling)."""
+    if needed <= len(array):
+        return array
+    capacity = max(needed, 2 * len(array), 16)
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+class ArrayStore:
+    """Contiguous array storage for neuron state and connection weights.
+
+    Neurons are numbered ``0..num_neurons-1`` through a name->index table and
+    their activations live in one state vector. Connections are kept as
+    parallel source/target/weight arrays addressed by an edge slot. Removals
+    swap the last neuron/edge into the freed slot, so indices are dense but not
+    stable across removals.
+
+    The (source name, target name) key of every edge (``edge_keys`` and
+    ``edge_slots``) is only built when something asks for it: bulk inserts
+    and loading fill the arrays alone.
+    """
+    def __init__(self, dtype=np.float64, capacity=16):
+        self.dtype = np.dtype(dtype)
+        self.names = []
+        self.index = {}
+        self.neuron_objects = []
+        self.state = np.zeros(capacity, dtype=self.dtype)
+        # Edge key index; None until needed, see _edge_index
+        self._edge_keys = []
+        self._edge_slots = {}
+        self._num_edges = 0
+        self.sources = np.zeros(capacity, dtype=np.int32)
+        self.targets = np.zeros(capacity, dtype=np.int32)
+        self.weights = np.zeros(capacity, dtype=self.dtype)
+        # Decay epoch at which each weight was last brought up to date (see Network.decay_factor)
+        self.epochs = np.zeros(capacity, dtype=np.int64)
+        self.created = np.zeros(capacity, dtype=np.int64)
+
+    @property
+    def num_neurons(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return self._num_edges
+
+    @property
+    def edge_keys(self):
+        """(source, target) name pair of every edge slot."""
+        return self._edge_index()[0]
+
+    @property
+    def edge_slots(self):
+        """Edge slot of every (source, target) name pair."""
+        return self._edge_index()[1]
+
+    def _edge_index(self):
+        if self._edge_keys is None:
+            n, names = self._num_edges, self.names
+            self._edge_keys = list(zip(map(names.__getitem__, self.sources[:n].tolist()),
+                                       map(names.__getitem__, self.targets[:n].tolist())))
+            self._edge_slots = dict(zip(self._edge_keys, range(n)))
+        return self._edge_keys, self._edge_slots
+
+    def drop_edge_index(self, num_edges):
+        """Call after replacing the edge arrays directly; ``num_edges`` is the number of edges in them."""
+        self._num_edges = num_edges
+        self._edge_keys = self._edge_slots = None
+
+    # --- Neurons ---
+    def add_neuron(self, neuron, value=0.0):
+        idx = len(self.names)
+        self.state = _grow(self.state, idx + 1)
+        self.names.append(neuron.name)
+        self.index[neuron.name] = idx
+        self.neuron_objects.append(neuron)
+        self.state[idx] = value
+        return idx
+
+    def add_neurons(self, neurons, values):
+        start = len(self.names)
+        self.state = _grow(self.state, start + len(neurons))
+        self.names.extend(neuron.name for neuron in neurons)
+        self.index.update((neuron.name, start + i) for i, neuron in enumerate(neurons))
+        self.neuron_objects.extend(neurons)
+        self.state[start:start + len(neurons)] = values
+
+    def remove_neuron(self, name, incident=None, moved_edges=None):
+        """Remove a neuron, its state and its connections.
+
+        ``incident`` (keys of the neuron's connections) and ``moved_edges``
+        (keys of the connections of the last neuron, which is moved into the
+        freed index) let callers that keep an adjacency index avoid scanning
+        every edge.
+        """
+        idx = self.index[name]
+        last = len(self.names) - 1
+        if incident is None:
+            n = self.num_edges
+            slots = np.flatnonzero((self.sources[:n] == idx) | (self.targets[:n] == idx))
+            incident = [self.edge_keys[slot] for slot in slots]
+        for key in incident:
+            self.remove_edge(key)
+
+        if idx != last:
+            moved = self.names[last]
+            self.names[idx] = moved
+            self.neuron_objects[idx] = self.neuron_objects[last]
+            self.index[moved] = idx
+            self.state[idx] = self.state[last]
+            if moved_edges is None:
+                n = self.num_edges
+                self.sources[:n][self.sources[:n] == last] = idx
+                self.targets[:n][self.targets[:n] == last] = idx
+            else:
+                for key in moved_edges:
+                    slot = self.edge_slots[key]
+                    if self.sources[slot] == last:
+                        self.sources[slot] = idx
+                    if self.targets[slot] == last:
+                        self.targets[slot] = idx
+        self.names.pop()
+        self.neuron_objects.pop()
+        del self.index[name]
+        self.state[last] = 0
+
+    def rename_neuron(self, old_name, new_name, old_keys, new_keys):
+        """Rename a neuron; ``old_keys``/``new_keys`` are its connection keys before/after."""
+        idx = self.index.pop(old_name)
+        self.index[new_name] = idx
+        self.names[idx] = new_name
+        self.neuron_objects[idx].name = new_name
+        slots = [self.edge_slots.pop(key) for key in old_keys]
+        for key, slot in zip(new_keys, slots):
+            self.edge_slots[key] = slot
+            self.edge_keys[slot] = key
+
+    # --- Connections ---
+    def set_edge(self, source, target, weight, epoch=0):
+        key = (source, target)
+        slot = self.edge_slots.get(key)
+        if slot is None:
+            slot = self.num_edges
+            self.sources = _grow(self.sources, slot + 1)
+            self.targets = _grow(self.targets, slot + 1)
+            self.weights = _grow(self.weights, slot + 1)
+            self.epochs = _grow(self.epochs, slot + 1)
+            self.created = _grow(self.created, slot + 1)
+            self._edge_keys.append(key)
+            self._edge_slots[key] = slot
+            self._num_edges += 1
+            self.sources[slot] = self.index[source]
+            self.targets[slot] = self.index[target]
+            self.created[slot] = epoch
+        self.weights[slot] = weight
+        self.epochs[slot] = epoch
+        return slot
+
+    def set_edges(self, sources, targets, weights, epoch=0):
+        """set_edge for many edges given as neuron index arrays; returns the number of new edges.
+
+        Pairs are matched against the existing edges with one sort instead of
+        one lookup each. Existing edges get their new weight in place, new
+        ones are appended in one go; for a pair given more than once the last
+        weight wins. The edge key index is extended only when it exists and
+        the new edges are fewer than the existing ones; otherwise it is
+        dropped and rebuilt when next needed.
+        """
+        n, count = max(self.num_neurons, 1), self.num_edges
+        codes = sources.astype(np.int64) * n + targets
+        _, last = np.unique(codes[::-1], return_index=True)
+        rows = np.sort(len(codes) - 1 - last)
+        codes = codes[rows]
+        existing_codes = self.sources[:count].astype(np.int64) * n + self.targets[:count]
+        order = np.argsort(existing_codes)
+        positions = np.minimum(np.searchsorted(existing_codes[order], codes), max(count - 1, 0))
+        found = existing_codes[order][positions] == codes if count else np.zeros(len(codes), dtype=bool)
+        slots = order[positions[found]]
+        self.weights[slots] = weights[rows[found]]
+        self.epochs[slots] = epoch
+
+        new = rows[~found]
+        start, end = count, count + len(new)
+        self.sources = _grow(self.sources, end)
+        self.targets = _grow(self.targets, end)
+        self.weights = _grow(self.weights, end)
+        self.epochs = _grow(self.epochs, end)
+        self.created = _grow(self.created, end)
+        self.sources[start:end] = sources[new]
+        self.targets[start:end] = targets[new]
+        self.weights[start:end] = weights[new]
+        self.epochs[start:end] = epoch
+        self.created[start:end] = epoch
+        self._num_edges = end
+        if self._edge_keys is not None and len(new) <= count:
+            names = self.names
+            new_keys = list(zip(map(names.__getitem__, sources[new].tolist()), map(names.__getitem__, targets[new].tolist())))
+            self._edge_keys.extend(new_keys)
+            self._edge_slots.update(zip(new_keys, range(start, end)))
+        elif len(new):
+            self._edge_keys = self._edge_slots = None
+        return len(new)
+
+    def remove_edge(self, key):
+        slot = self.edge_slots.pop(key)
+        last = self.num_edges - 1
+        if slot != last:
+            moved = self.edge_keys[last]
+            self.edge_keys[slot] = moved
+            self.edge_slots[moved] = slot
+            self.sources[slot] = self.sources[last]
+            self.targets[slot] = self.targets[last]
+            self.weights[slot] = self.weights[last]
+            self.epochs[slot] = self.epochs[last]
+            self.created[slot] = self.created[last]
+        self.edge_keys.pop()
+        self._num_edges -= 1
+        self.weights[last] = 0
+
+class ArrayConnection:
+    """Connection handle whose weight lives in the network's ArrayStore."""
+    __slots__ = ('_network', '_store', 'source', 'target')
+
+    def __init__(self, network, source_name, target_name):
+        self._network = network
+        self._store = network.store
+        self.source = source_name
+        self.target = target_name
+
+    def _slot(self):
+        return self._store.edge_slots[(self.source, self.target)]
+
+    @property
+    def weight(self):
+        # Scalar version of Network._array_weights: reading edges one at a time is common
+        store, network = self._store, self._network
+        slot = store.edge_slots[(self.source, self.target)]
+        epoch = store.epochs.item(slot)
+        if epoch != network.decay_epoch:
+            store.weights[slot] *= network.decay_factor(epoch)
+            store.epochs[slot] = network.decay_epoch
+        return store.weights.item(slot)
+
+    @weight.setter
+    def weight(self, value):
+        slot = self._slot()
+        self._store.weights[slot] = value
+        self._store.epochs[slot] = self._network.decay_epoch
+        self._network._weight_changed(self.target)
+        if self._network.journal is not None:
+            self._network.journal.record('weights', [[self.source, self.target]], [float(value)])
+
+    def get_weight(self):
+        return self.weight
+
+    def set_weight(self, new_weight):
+        self.weight = max(-1.0, min(1.0, new_weight))
+
+class _ConnectionItems(ItemsView):
+    # Iterates without the per-key membership check of ConnectionView.__getitem__
+    def __iter__(self):
+        network = self._mapping._network
+        for key in self._mapping._store.edge_keys:
+            yield key, ArrayConnection(network, *key)
+
+class _ConnectionValues(ValuesView):
+    def __iter__(self):
+        network = self._mapping._network
+        for key in self._mapping._store.edge_keys:
+            yield ArrayConnection(network, *key)
+
+class NeuronView(MutableMapping):
+    """``Network.neurons`` mapping over an ArrayStore."""
+    def __init__(self, network):
+        self._network = network
+        self._store = network.store
+
+    def __getitem__(self, name):
+        return self._store.neuron_objects[self._store.index[name]]
+
+    def __setitem__(self, name, neuron):
+        idx = self._store.index.get(name)
+        if idx is None:
+            neuron.name = name
+            self._store.add_neuron(neuron)
+            self._network.invalidate_topology()
+        else:
+            self._store.neuron_objects[idx] = neuron
+
+    def __delitem__(self, name):
+        if not self._network.remove_neuron(name):
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        return name in self._store.index
+
+    def __iter__(self):
+        return iter(self._store.names)
+
+    def __len__(self):
+        return self._store.num_neurons
+
+class StateView(MutableMapping):
+    """``Network.state`` mapping over the ArrayStore state vector.
+
+    Keys that are not neurons (e.g. ``SIM_*`` inputs) are kept in a side dict.
+    Every neuron always has an activation; deleting one resets it to 0.
+    """
+    def __init__(self, network):
+        self._store = network.store
+        self._extra = {}
+
+    def __getitem__(self, name):
+        idx = self._store.index.get(name)
+        if idx is None:
+            return self._extra[name]
+        return float(self._store.state[idx])
+
+    def __setitem__(self, name, value):
+        idx = self._store.index.get(name)
+        if idx is None:
+            self._extra[name] = value
+        else:
+            self._store.state[idx] = value
+
+    def __delitem__(self, name):
+        idx = self._store.index.get(name)
+        if idx is None:
+            del self._extra[name]
+        else:
+            self._store.state[idx] = 0
+
+    def __contains__(self, name):
+        return name in self._store.index or name in self._extra
+
+    def __iter__(self):
+        yield from self._store.names
+        yield from self._extra
+
+    def __len__(self):
+        return self._store.num_neurons + len(self._extra)
+
+    def copy(self):
+        return dict(self.items())
+
+    def replace(self, mapping):
+        """Overwrite the whole state, as assigning a new dict would in dict storage."""
+        values = dict(mapping)
+        self._store.state[:self._store.num_neurons] = 0
+        self._extra = {}
+        for name, value in values.items():
+            self[name] = value
+
+class ConnectionView(MutableMapping):
+    """``Network.connections`` mapping over the ArrayStore edge arrays."""
+    def __init__(self, network):
+        self._network = network
+        self._store = network.store
+
+    def __getitem__(self, key):
+        if key not in self._store.edge_slots:
+            raise KeyError(key)
+        return ArrayConnection(self._network, *key)
+
+    def __setitem__(self, key, conn):
+        source, target = key
+        if not self._network.connect(source, target, conn.get_weight()):
+            raise KeyError(f"Unknown neuron in connection {source}->{target}")
+
+    def __delitem__(self, key):
+        if not self._network.remove_connection(*key):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._store.edge_slots
+
+    def __iter__(self):
+        return iter(self._store.edge_keys)
+
+    def __len__(self):
+        return self._store.num_edges
+
+    def items(self):
+        return _ConnectionItems(self)
+
+    def values(self):
+        return _ConnectionValues(self)
+
+    def replace(self, mapping):
+        """Overwrite all connections, as assigning a new dict would in dict storage."""
+        # Read the weights first: the values may be handles into this very store
+        weights = [(key, conn.get_weight()) for key, conn in mapping.items()]
+        for key in list(self._store.edge_keys):
+            self._store.remove_edge(key)
+        for (source, target), weight in weights:
+            self._store.set_edge(source, target, weight, self._network.decay_epoch)
+        self._network.invalidate_topology()
@@ -0,0 +1,98 @@
+# NeuralNetwork/training_worker.py
+import threading
+import time
+import numpy as np
+from PyQt5 import QtCore
+from .learning import Dataset, DatasetView, SampleStream
+
+class TrainingWorker(QtCore.QThread):
+    """Runs BackpropNetwork training on a background thread.
+
+    ``start`` takes a snapshot of the learner (``detached_copy``) and of the
+    training samples, so the GUI can keep capturing samples and calling
+    ``forward_pass`` or ``predict`` on the learner while the copy trains.
+    ``progress(epoch, error)`` is emitted at most every ``progress_interval``
+    seconds and once more for the final epoch. ``cancel`` stops training at
+    the end of the current epoch. When the thread ends, the trained weights
+    are swapped into the learner in one step on the GUI thread (after a
+    cancel only if ``keep_on_cancel``, and never after ``cancel(discard=True)``),
+    then ``completed(epoch_errors)`` is emitted; errors are reported through
+    ``failed(message)`` instead. Cancel with ``discard`` before changing the
+    learner's weights yourself (say, randomizing them), or the swap, which
+    still runs after ``wait`` returns, overwrites them.
+    Extra keyword arguments are passed to ``BackpropNetwork.fit``.
+    """
+    progress = QtCore.pyqtSignal(int, float)
+    completed = QtCore.pyqtSignal(list)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, learner, training_data, progress_interval=0.1, keep_on_cancel=False, parent=None, **fit_options):
+        super().__init__(parent)
+        self.learner = learner
+        self.training_data = training_data
+        self.progress_interval = progress_interval
+        self.keep_on_cancel = keep_on_cancel
+        self.fit_options = fit_options
+        self._cancelled = threading.Event()
+        self._discard = False
+        self._copy = None
+        self._samples = None
+        self._errors = []
+        self._error = None
+        self.finished.connect(self._swap_in)
+
+    def start(self, *args):
+        self._cancelled.clear()
+        self._discard = False
+        self._copy = self.learner.detached_copy()
+        data = self.training_data
+        if isinstance(data, (SampleStream, DatasetView)):
+            self._samples = data
+        elif isinstance(data, Dataset):
+            # Rows captured while training runs are left for the next run
+            self._samples = DatasetView(data, np.arange(len(data)))
+        else:
+            self._samples = Dataset.from_samples(data)
+        self._errors, self._error = [], None
+        super().start(*args)
+
+    def cancel(self, discard=False):
+        # discard is only read by _swap_in, on the GUI thread
+        self._discard = self._discard or discard
+        self._cancelled.set()
+
+    def was_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        last_report = 0.0
+
+        def report(epoch, avg_error):
+            nonlocal last_report
+            self._errors.append(avg_error)
+            now = time.monotonic()
+            if now - last_report >= self.progress_interval:
+                last_report = now
+                self.progress.emit(epoch, avg_error)
+            return not self._cancelled.is_set()
+
+        try:
+            self._copy.fit(self._samples, progress_callback=report, **self.fit_options)
+        except Exception as error:
+            self._error = error
+
+    def _swap_in(self):
+        # Runs on the thread that owns the worker (the GUI thread)
+        trained, self._copy, self._samples = self._copy, None, None
+        if self._error is not None:
+            self.failed.emit(str(self._error))
+            return
+        if self._errors:
+            self.progress.emit(len(self._errors) - 1, self._errors[-1])
+        if not self._discard and (not self.was_cancelled() or self.keep_on_cancel):
+            try:
+                self.learner.adopt(trained)
+            except ValueError as error:
+                self.failed.emit(str(error))
+                return
+        self.completed.emit(list(self._errors))
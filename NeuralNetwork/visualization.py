@@ -83,6 +83,7 @@ class NetworkVisualization(QtWidgets.QWidget):
 
         # Draw Connections
         if self.show_links:
+            self.network.materialize_weights()
             for (source, target), conn in self.network.connections.items():
                 if source in self.network.neurons and target in self.network.neurons:
                     p1 = QtCore.QPointF(*self.network.neurons[source].get_position())
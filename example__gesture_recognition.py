@@ -2,16 +2,17 @@
 import sys
 import os
 import numpy as np
-import random
 import cv2
 from PyQt5 import QtWidgets, QtCore, QtGui
 from NeuralNetwork.core import Network
 from NeuralNetwork.learning import BackpropNetwork
+from NeuralNetwork.training_worker import TrainingWorker
 
 class GestureRecognitionApp(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
         self.gestures = ["fist", "peace", "thumbs_up", "open_hand"]
+        self.training_worker = None
         self.setup_network()
         self.setup_ui()
         self.detect_available_cameras()
@@ -106,29 +107,21 @@ class GestureRecognitionApp(QtWidgets.QMainWindow):
         
         # Input layer (16x16 grayscale image = 256 neurons)
         self.input_neurons = [f"pixel_{i}" for i in range(256)]
-        for i, name in enumerate(self.input_neurons):
-            x = 50 + (i % 16) * 20
-            y = 50 + (i // 16) * 20
-            self.network.add_neuron(name, 0, (x, y), "input")
+        self.network.add_neurons(self.input_neurons, 0,
+                                 [(50 + (i % 16) * 20, 50 + (i // 16) * 20) for i in range(256)], "input")
         
         # Hidden layer
         self.hidden_neurons = [f"hidden_{i}" for i in range(32)]
-        for i, name in enumerate(self.hidden_neurons):
-            self.network.add_neuron(name, 0, (400, 50 + i * 30), "hidden")
+        self.network.add_neurons(self.hidden_neurons, 0, [(400, 50 + i * 30) for i in range(32)], "hidden")
         
         # Output layer (one neuron per gesture)
         self.output_neurons = [f"{g}_out" for g in self.gestures]
-        for i, name in enumerate(self.output_neurons):
-            self.network.add_neuron(name, 0, (600, 100 + i * 60), "output")
+        self.network.add_neurons(self.output_neurons, 0,
+                                 [(600, 100 + i * 60) for i in range(len(self.output_neurons))], "output")
         
         # Connections
-        for input_n in self.input_neurons:
-            for hidden_n in self.hidden_neurons:
-                self.network.connect(input_n, hidden_n, random.uniform(-0.2, 0.2))
-                
-        for hidden_n in self.hidden_neurons:
-            for output_n in self.output_neurons:
-                self.network.connect(hidden_n, output_n, random.uniform(-0.2, 0.2))
+        self.network.connect_layers(self.input_neurons, self.hidden_neurons, 'uniform', low=-0.2, high=0.2)
+        self.network.connect_layers(self.hidden_neurons, self.output_neurons, 'uniform', low=-0.2, high=0.2)
         
         self.backprop_learner = BackpropNetwork(self.network, learning_rate=0.1)
         self.backprop_learner.set_layers([self.input_neurons, self.hidden_neurons, self.output_neurons])
@@ -296,34 +289,34 @@ class GestureRecognitionApp(QtWidgets.QMainWindow):
         if not self.training_data:
             QtWidgets.QMessageBox.warning(self, "Error", "No training samples collected")
             return
+        if self.training_worker and self.training_worker.isRunning():
+            return
             
-        # Create progress dialog
+        # Create progress dialog (not modal: gesture recognition keeps running while training)
         progress = QtWidgets.QProgressDialog("Training Network...", "Cancel", 0, 1000, self)
-        progress.setWindowModality(QtCore.Qt.WindowModal)
         progress.show()
         
-        # Training callback
-        def progress_callback(epoch, error):
-            progress.setValue(epoch)
-            QtWidgets.QApplication.processEvents()
-            return not progress.wasCanceled()
-        
-        # Train network
-        try:
-            self.backprop_learner.train(
-                self.training_data,
-                epochs=1000,
-                target_error_threshold=0.01,
-                progress_callback=progress_callback
-            )
-            self.statusBar().showMessage("Training completed successfully")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Training Error", str(e))
-        finally:
-            progress.close()
+        # Train network on a background thread; the trained weights are swapped in when it finishes
+        self.training_worker = TrainingWorker(
+            self.backprop_learner,
+            self.training_data,
+            keep_on_cancel=True,
+            parent=self,
+            epochs=1000,
+            target_error_threshold=0.01
+        )
+        self.training_worker.progress.connect(lambda epoch, error: progress.setValue(epoch))
+        self.training_worker.completed.connect(lambda errors: self.statusBar().showMessage("Training completed successfully"))
+        self.training_worker.failed.connect(lambda message: QtWidgets.QMessageBox.critical(self, "Training Error", message))
+        self.training_worker.finished.connect(progress.close)
+        progress.canceled.connect(self.training_worker.cancel)
+        self.training_worker.start()
             
     def closeEvent(self, event):
         self.timer.stop()
+        if self.training_worker and self.training_worker.isRunning():
+            self.training_worker.cancel()
+            self.training_worker.wait()
         if hasattr(self, 'cap') and self.cap.isOpened():
             self.cap.release()
         event.accept()
@@ -115,6 +115,8 @@ class PongGame:
             
         # Train the network
         self.backprop_learner.train(training_data, epochs=100, target_error_threshold=0.01)
+        # Per-frame decisions use a frozen copy of the trained weights
+        self.ai_model = self.backprop_learner.freeze()
         print("AI Training complete.")
         print("Use cursor UP and DN to play")
     
@@ -134,7 +136,7 @@ class PongGame:
         ]
         
         # Get the network's decision
-        output = self.backprop_learner.forward_pass(inputs)[0]
+        output = self.ai_model.predict(inputs)[0]
         
         # Interpret the output to move the paddle
         ai_move = 0
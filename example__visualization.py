@@ -180,8 +180,8 @@ class NetworkVisApp(QtWidgets.QMainWindow):
         if neuron_name in self.network.neurons:
             neuron = self.network.neurons[neuron_name]
             state_val = self.network.state.get(neuron_name, 0.0)
-            num_outgoing = sum(1 for (src, _) in self.network.connections if src == neuron_name)
-            num_incoming = sum(1 for (_, tgt) in self.network.connections if tgt == neuron_name)
+            num_outgoing = len(self.network.get_outgoing(neuron_name))
+            num_incoming = len(self.network.get_incoming(neuron_name))
             info_text = (f"<b>Neuron: {neuron.name}</b><br>"
                          f"Type: {neuron.type}<br>"
                          f"Activation: {state_val:.2f}<br>"
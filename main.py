@@ -10,6 +10,14 @@ import math
 from NeuralNetwork.core import Network, Config
 from NeuralNetwork.visualization import NetworkVisualization
 from NeuralNetwork.inspector import NeuronInspectorDialog
+from NeuralNetwork.journal import Journal
+from NeuralNetwork.autosave import AutoSaver
+
+# .npz is the binary format (see NeuralNetwork/formats.py), much faster for large networks
+NETWORK_FILE_FILTERS="JSON (*.json);;Binary network (*.npz);;Compressed JSON (*.json.gz *.json.bz2 *.json.xz)"
+NETWORK_FILE_EXTENSIONS=(".json",".npz",".json.gz",".json.bz2",".json.xz")
+# Networks that have a file are autosaved next to it (brain.json -> brain.autosave.npz) on a background thread
+AUTOSAVE_INTERVAL_S=60
 
 class NetworkBuilderGUI(QtWidgets.QMainWindow):
     def __init__(self):
@@ -25,6 +33,10 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
         self.neuron_counter = 0
         self.layer_counter = 0
         self.set_mode("select")
+        self.autosaver = None
+        self.autosave_timer = QtCore.QTimer(self)
+        self.autosave_timer.timeout.connect(lambda: self.autosaver and self.autosaver.poll())
+        self.autosave_timer.start(1000)
 
     def _define_context_menu_handlers(self):
         def show_visualization_context_menu(position_widget):
@@ -227,11 +239,12 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
     def create_menu_bar(self):
         menu_bar = self.menuBar()
         file_menu = menu_bar.addMenu("&File")
+        self.journal_saves_action = QtWidgets.QAction("&Incremental Saves (Journal)", self, checkable=True, checked=False); self.journal_saves_action.setStatusTip("Append changes to a .journal next to the file instead of rewriting it on every save.")
         file_actions = {"&New Network": (self.new_network_action, "Ctrl+N", "Create a new, empty network."), "&Open Network...": (self.open_network_action, "Ctrl+O", "Open a network from a JSON file."), "&Save Network...": (self.save_network_action, "Ctrl+S", "Save the current network to a JSON file."), "E&xit": (self.close, "Ctrl+Q", "Exit the application.")}
         for text, (func, shortcut, tooltip) in file_actions.items():
             action = QtWidgets.QAction(text, self); action.triggered.connect(func); action.setShortcut(shortcut); action.setStatusTip(tooltip)
             file_menu.addAction(action)
-            if text == "&Save Network...": file_menu.addSeparator()
+            if text == "&Save Network...": file_menu.addAction(self.journal_saves_action); file_menu.addSeparator()
         edit_menu = menu_bar.addMenu("&Edit")
         edit_actions = {"&Clear Network": (self.clear_network_action, "Ctrl+Shift+N", "Remove all neurons and connections."), "&Randomize Weights": (self.randomize_weights_action, "", "Assign random weights to all connections.")}
         for text, (func, shortcut, tooltip) in edit_actions.items():
@@ -418,16 +431,7 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
             changed = True
         if self.network.state.get(original_name) != new_val: self.network.state[original_name] = new_val; changed = True
         if new_name and new_name != original_name:
-            if new_name not in self.network.neurons:
-                self.network.neurons[new_name] = self.network.neurons.pop(original_name); neuron.name = new_name
-                if original_name in self.network.state: self.network.state[new_name] = self.network.state.pop(original_name)
-                conns_to_remap = {}
-                for (s, t), conn_obj_ref in list(self.network.connections.items()):
-                    ns, nt = s, t
-                    if s == original_name: ns = new_name
-                    if t == original_name: nt = new_name
-                    if ns != s or nt != t: conn_obj_ref.source, conn_obj_ref.target = ns, nt; conns_to_remap[(s,t)] = (ns,nt)
-                for old_k, new_k in conns_to_remap.items(): self.network.connections[new_k] = self.network.connections.pop(old_k)
+            if self.network.rename_neuron(original_name, new_name):
                 for l_data in self.layers.values():
                     if original_name in l_data['neurons']: l_data['neurons'] = [new_name if n == original_name else n for n in l_data['neurons']]
                 self.selected_item = new_name; renamed_inspector_target = new_name; changed = True
@@ -484,17 +488,8 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
         if prop_name=="name":
             new_name_str=str(new_value).strip()
             if new_name_str and new_name_str!=original_neuron_name and new_name_str not in self.network.neurons:
-                neuron_obj_to_rename=self.network.neurons.pop(original_neuron_name)
-                neuron_obj_to_rename.name=new_name_str; self.network.neurons[new_name_str]=neuron_obj_to_rename
+                self.network.rename_neuron(original_neuron_name,new_name_str)
                 target_neuron_name=new_name_str; renamed_to=new_name_str
-                if original_neuron_name in self.network.state:self.network.state[new_name_str]=self.network.state.pop(original_neuron_name)
-                conns_to_remap={}
-                for(s,t),conn_obj in list(self.network.connections.items()):
-                    ns,nt=s,t
-                    if s==original_neuron_name:ns=new_name_str
-                    if t==original_neuron_name:nt=new_name_str
-                    if ns!=s or nt!=t:conn_obj.source,conn_obj.target=ns,nt;conns_to_remap[(s,t)]=(ns,nt)
-                for old_key,new_key in conns_to_remap.items():self.network.connections[new_key]=self.network.connections.pop(old_key)
                 for l_data in self.layers.values():
                     if original_neuron_name in l_data['neurons']:l_data['neurons']=[new_name_str if n==original_neuron_name else n for n in l_data['neurons']]
                 if self.selected_item==original_neuron_name:self.selected_item=new_name_str
@@ -527,9 +522,7 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
 
     def remove_neuron_logic(self, name_to_remove):
         if name_to_remove in self.active_inspectors: self.active_inspectors.pop(name_to_remove).close()
-        self.network.connections={k:v for k,v in self.network.connections.items() if name_to_remove not in k}
-        if name_to_remove in self.network.neurons: del self.network.neurons[name_to_remove]
-        if name_to_remove in self.network.state: del self.network.state[name_to_remove]
+        self.network.remove_neuron(name_to_remove)
         for l_data in self.layers.values():
             if name_to_remove in l_data['neurons']: l_data['neurons'].remove(name_to_remove)
         self.update_simulation_combo()
@@ -540,8 +533,7 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
 
     def remove_connection(self, source_name, target_name):
         conn_key=(source_name, target_name)
-        if conn_key in self.network.connections:
-            del self.network.connections[conn_key]
+        if self.network.remove_connection(source_name, target_name):
             if self.selected_item==conn_key:self.clear_selection_action()
             self.update_network_statistics();self.vis.update()
             self.statusBar().showMessage(f"Removed Connection: '{source_name}' -> '{target_name}'")
@@ -602,13 +594,10 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
             s_n,t_n=self.layers[sname]['neurons'],self.layers[tname]['neurons']
             ctype,w_min_v,w_max_v=type_c.currentText(),min_w.value(),max_w.value();added_c=0
             if ctype=="Fully Connected":
-                for s_neuron in s_n:
-                    for t_neuron in t_n: 
-                        if self.network.connect(s_neuron,t_neuron,random.uniform(w_min_v,w_max_v)):added_c+=1
+                added_c=self.network.connect_layers(s_n,t_n,'uniform',low=w_min_v,high=w_max_v)
             elif ctype=="One-to-One (Matching Size)":
                 if len(s_n)!=len(t_n):QtWidgets.QMessageBox.warning(self,"Error","One-to-One size mismatch.");return
-                for s_neuron,t_neuron in zip(s_n,t_n):
-                    if self.network.connect(s_neuron,t_neuron,random.uniform(w_min_v,w_max_v)):added_c+=1
+                added_c=self.network.connect_many(s_n,t_n,[random.uniform(w_min_v,w_max_v) for _ in s_n])
             self.update_network_statistics();self.vis.update();self.statusBar().showMessage(f"Added {added_c} conns.")
 
     def create_feedforward_dialog(self):
@@ -636,15 +625,13 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
             cfg_app=self.network.config.neurogenesis['appearance']
             color=cfg_app['colors'].get(n_type,cfg_app['colors']['default'])
             shape=cfg_app['shapes'].get(n_type,cfg_app['shapes']['default'])
-            for i in range(size):
-                n_name=f"{n_type}{idx}_{i}";y_pos=y_s+i*neuron_v_spacing
-                attrs={'shape':shape,'color':color,'layer':name}
-                self.network.add_neuron(n_name,50.0,(x_pos,y_pos),n_type,attrs);current_neurons.append(n_name)
+            current_neurons=[f"{n_type}{idx}_{i}" for i in range(size)]
+            positions=[(x_pos,y_s+i*neuron_v_spacing) for i in range(size)]
+            self.network.add_neurons(current_neurons,50.0,positions,n_type,{'shape':shape,'color':color,'layer':name})
             self.layers[name]={'neurons':current_neurons,'color':QtGui.QColor(*color).name()}
             all_layers_neurons.append(current_neurons)
         for i in range(len(all_layers_neurons)-1):
-            for src_n in all_layers_neurons[i]:
-                for tgt_n in all_layers_neurons[i+1]:self.network.connect(src_n,tgt_n,random.uniform(min_w,max_w))
+            self.network.connect_layers(all_layers_neurons[i],all_layers_neurons[i+1],'uniform',low=min_w,high=max_w)
         self.neuron_counter=len(self.network.neurons);self.layer_counter=len(self.layers)
         self.update_simulation_combo();self.vis.set_layers_data(self.layers);self.update_network_statistics();self.vis.update()
 
@@ -697,11 +684,12 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
         updated=self.network.perform_learning()
         if updated is not None:
             msg=f"Hebbian: {len(updated)} pairs updated." if updated else "Hebbian: No co-activity."
+            if self.network.last_pruned_count:msg+=f" {self.network.last_pruned_count} connections pruned."
             for n1,n2 in (updated or []):
                 for name in [n1,n2]:
                     if name in self.active_inspectors:self.active_inspectors[name].populate_connections_tab()
         else:msg="Hebbian: Skipped (too soon)."
-        self.statusBar().showMessage(msg);self.vis.update()
+        self.statusBar().showMessage(msg);self.update_network_statistics();self.vis.update()
 
     def propagate_activation_action(self):
         self.network.propagate_activation();self.statusBar().showMessage("Activation propagated.")
@@ -714,12 +702,14 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
             self.clear_network_action(confirm=False)
 
     def open_network_action(self):
-        path,_=QtWidgets.QFileDialog.getOpenFileName(self,"Open Network","","JSON (*.json)")
+        path,_=QtWidgets.QFileDialog.getOpenFileName(self,"Open Network","",NETWORK_FILE_FILTERS)
         if path:
             net=Network.load(path)
             if net:
+                if self.journal_saves_action.isChecked():Journal(net,path) # later saves to the same file only append the changes
                 self.clear_network_action(confirm=False)
                 self.network=net;self.vis.network=net;self.layers={}
+                self.start_autosave(net,path)
                 max_idx=-1
                 for n_name,n_obj in self.network.neurons.items():
                     l_attr=n_obj.attributes.get('layer')
@@ -740,16 +730,35 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
 
     def save_network_action(self):
         default_fn="neural_network.json"
-        path,_=QtWidgets.QFileDialog.getSaveFileName(self,"Save Network",default_fn,"JSON (*.json)")
+        path,selected_filter=QtWidgets.QFileDialog.getSaveFileName(self,"Save Network",default_fn,NETWORK_FILE_FILTERS)
         if path:
-            if not path.endswith(".json"):path+=".json"
+            ext=".npz" if "*.npz" in selected_filter else ".json.gz" if "*.json.gz" in selected_filter else ".json"
+            if not path.lower().endswith(NETWORK_FILE_EXTENSIONS):path+=ext
             self.network.config.neurogenesis['enabled_globally'] = self.network.neurogenesis_enabled
-            if self.network.save(path):self.statusBar().showMessage(f"Saved: {os.path.basename(path)}")
+            if self.journal_saves_action.isChecked():
+                # Saving again to the same file appends to its journal; the first save (or compaction) writes the whole network
+                journal=self.network.journal
+                if journal is None or journal.snapshot_path!=os.path.abspath(path):journal=Journal(self.network,path)
+                saved=journal.flush()
+            else:saved=self.network.save(path)
+            if saved:self.statusBar().showMessage(f"Saved: {os.path.basename(path)}");self.start_autosave(self.network,path)
             else:QtWidgets.QMessageBox.warning(self,"Error",f"Failed to save to {path}")
 
+    def start_autosave(self,network,path):
+        stem,ext=os.path.splitext(path)
+        if ext.lower() in (".gz",".bz2",".xz"):stem=os.path.splitext(stem)[0]
+        autosave_path=stem+".autosave.npz"
+        if self.autosaver and self.autosaver.network is network and self.autosaver.path==os.path.abspath(autosave_path):return
+        self.stop_autosave()
+        self.autosaver=AutoSaver(network,autosave_path,interval=AUTOSAVE_INTERVAL_S)
+
+    def stop_autosave(self):
+        if self.autosaver:self.autosaver.close();self.autosaver=None
+
     def clear_network_action(self,confirm=True):
         if confirm:
             if QtWidgets.QMessageBox.question(self,"Clear","Clear entire network?",QtWidgets.QMessageBox.Yes|QtWidgets.QMessageBox.No,QtWidgets.QMessageBox.No)==QtWidgets.QMessageBox.No:return
+        self.stop_autosave()
         for insp in list(self.active_inspectors.values()):insp.close()
         self.active_inspectors.clear()
         self.network=Network();self.vis.network=self.network;self.layers={}
@@ -785,7 +794,7 @@ class NetworkBuilderGUI(QtWidgets.QMainWindow):
 
     def closeEvent(self,event:QtGui.QCloseEvent):
         for insp in list(self.active_inspectors.values()):insp.close()
-        if QtWidgets.QMessageBox.question(self,'Exit',"Sure to exit?",QtWidgets.QMessageBox.Yes|QtWidgets.QMessageBox.No,QtWidgets.QMessageBox.No)==QtWidgets.QMessageBox.Yes:event.accept()
+        if QtWidgets.QMessageBox.question(self,'Exit',"Sure to exit?",QtWidgets.QMessageBox.Yes|QtWidgets.QMessageBox.No,QtWidgets.QMessageBox.No)==QtWidgets.QMessageBox.Yes:self.autosave_timer.stop();self.stop_autosave();event.accept()
         else:event.ignore()
 
 def main():
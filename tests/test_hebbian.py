@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from NeuralNetwork.core import Network, SimulatedClock
+
+
+def _degrees(net):
+    incoming, outgoing = net._adjacency()
+    return {name: len(outgoing[name]) + sum(1 for s in incoming[name] if s != name) for name in net.neurons}
+
+
+@pytest.mark.parametrize('storage', ['dict', 'array'])
+def test_edge_cap_holds_across_learning_cycles(storage):
+    rng = np.random.default_rng(0)
+    net = Network(storage, clock=SimulatedClock())
+    names = [f'n{i}' for i in range(40)]
+    net.add_neurons(names, 0.0, [(0, 0)] * len(names))
+    net.config.hebbian.update(max_edges_per_neuron=8, learning_interval=0, prune_min_age=10)
+    for _ in range(60):
+        for name in names:
+            net.state[name] = float(rng.uniform(0, 100))
+        updated = net.perform_learning()
+        net.clock.advance()
+        assert max(_degrees(net).values()) <= 8
+        assert all(pair in net.connections for pair in updated)
+    assert len(net.connections) > 0
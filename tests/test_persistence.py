@@ -0,0 +1,43 @@
+import pytest
+
+from NeuralNetwork.activations import get_activation
+from NeuralNetwork.core import Network
+from NeuralNetwork.journal import Journal
+
+
+def _network(storage):
+    net = Network(storage)
+    net.add_neuron('a', 0, (0, 0), 'input')
+    net.add_neuron('b', 50, (100, 0), 'hidden')
+    net.connect('a', 'b', 0.9)
+    net.state['a'] = 90
+    net.config.activations = {'hidden': 'relu', 'input': get_activation('linear')}
+    return net
+
+
+def _propagated(net):
+    net.propagate_activation()
+    return dict(net.state)
+
+
+@pytest.mark.parametrize('storage', ['dict', 'array'])
+@pytest.mark.parametrize('filename', ['brain.json', 'brain.json.gz', 'brain.npz'])
+def test_activations_survive_save_and_load(tmp_path, storage, filename):
+    path = tmp_path / filename
+    net = _network(storage)
+    assert net.save(path)
+    loaded = Network.load(path, storage)
+    assert loaded.config.activations == {'hidden': 'relu', 'input': 'linear'}
+    assert _propagated(loaded) == pytest.approx(_propagated(net))
+
+
+def test_activations_survive_journal_replay(tmp_path):
+    path = tmp_path / 'brain.json'
+    net = _network('dict')
+    journal = Journal(net, path)
+    assert journal.flush()
+    net.config.activations = {'input': 'relu'}
+    assert journal.flush()
+    loaded = Network.load(path)
+    assert loaded.config.activations == {'input': 'relu'}
+    assert _propagated(loaded) == pytest.approx(_propagated(net))